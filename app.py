@@ -4,9 +4,17 @@ import re
 import string
 import pandas as pd
 from PyPDF2 import PdfReader
-from sklearn.metrics.pairwise import cosine_similarity
 import anthropic
 import os
+import uuid
+
+import metrics
+from jobs import JobManager, JobLimitError, DONE, FAILED, CANCELLED
+from scoring import Scorer, LRUCache, text_hash
+from dedupe import NearDuplicateCache
+from keyword_gain import KeywordGainSimulator
+from artifacts import ArtifactStore, artifact_handle
+from explain import MatchExplainer
 
 # ------------------------
 # Text Cleaning
@@ -23,11 +31,12 @@ def clean_text(text):
 # PDF Reader
 # ------------------------
 def extract_text_from_pdf(file):
-    reader = PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        if page.extract_text():
-            text += page.extract_text()
+    with metrics.stage("pdf_extract"):
+        reader = PdfReader(file)
+        text = ""
+        for page in reader.pages:
+            if page.extract_text():
+                text += page.extract_text()
     return text
 
 # ------------------------
@@ -58,14 +67,40 @@ def format_job_description(overview, responsibilities, requirements, preferred):
     
     return "\n\n".join(jd_parts)
 
+# ------------------------
+# Claude API Call
+# ------------------------
+def call_claude(task, prompt, max_tokens, api_key=None, on_text=None):
+    """Send one prompt to Claude, streaming text chunks to on_text if given"""
+    # Background jobs pass api_key explicitly: st.session_state isn't available off the script thread
+    client = anthropic.Anthropic(api_key=api_key or st.session_state.get('api_key', ''))
+    
+    with metrics.stage(f"llm_{task}"):
+        if on_text is None:
+            message = client.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        else:
+            with client.messages.stream(
+                model="claude-sonnet-4-20250514",
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                for text in stream.text_stream:
+                    on_text(text)
+                message = stream.get_final_message()
+    metrics.record_llm_usage(task, message.usage)
+    
+    return message.content[0].text
+
 # ------------------------
 # ATS Analysis with Claude
 # ------------------------
-def analyze_ats_score(resume_text, job_description, similarity_score):
+def analyze_ats_score(resume_text, job_description, similarity_score, api_key=None, on_text=None):
     """Get detailed ATS analysis using Claude AI"""
     try:
-        client = anthropic.Anthropic(api_key=st.session_state.get('api_key', ''))
-        
         prompt = f"""You are an expert ATS (Applicant Tracking System) analyzer. Analyze this resume against the job description and provide a detailed ATS score breakdown.
 
 **Job Description:**
@@ -118,23 +153,24 @@ Please provide a comprehensive analysis with the following sections:
 
 Format your response clearly with these exact section headers."""
 
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2500,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return message.content[0].text
+        return call_claude("ats_analysis", prompt, 2500, api_key=api_key, on_text=on_text)
     except Exception as e:
         return f"Error analyzing ATS score: {str(e)}"
 
 # ------------------------
 # Resume Optimization
 # ------------------------
-def optimize_resume(resume_text, job_description, ats_analysis):
+def optimize_resume(resume_text, job_description, ats_analysis, api_key=None, on_text=None, priority_keywords=None):
     """Generate optimized resume suggestions using Claude AI"""
     try:
-        client = anthropic.Anthropic(api_key=st.session_state.get('api_key', ''))
+        keyword_focus = ""
+        if priority_keywords:
+            keyword_focus = f"""
+**Highest-Impact Missing Keywords** (ranked by how much each would raise the TF-IDF match score):
+{", ".join(priority_keywords)}
+
+Prioritize working these keywords in naturally where the candidate's experience supports them.
+"""
         
         prompt = f"""You are an expert resume writer and career coach. Based on the ATS analysis, provide specific, actionable recommendations to optimize this resume.
 
@@ -146,7 +182,7 @@ def optimize_resume(resume_text, job_description, ats_analysis):
 
 **ATS Analysis:**
 {ats_analysis}
-
+{keyword_focus}
 Please provide detailed optimization suggestions organized as follows:
 
 1. **Priority Actions** (Must-Do):
@@ -187,24 +223,16 @@ Please provide detailed optimization suggestions organized as follows:
 
 Make all suggestions concrete and actionable. Provide specific text examples wherever possible."""
 
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3500,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return message.content[0].text
+        return call_claude("optimization", prompt, 3500, api_key=api_key, on_text=on_text)
     except Exception as e:
         return f"Error optimizing resume: {str(e)}"
 
 # ------------------------
 # Cover Letter Generation
 # ------------------------
-def generate_cover_letter(resume_text, job_description, company_name="", position_title=""):
+def generate_cover_letter(resume_text, job_description, company_name="", position_title="", api_key=None, on_text=None):
     """Generate a tailored cover letter using Claude AI"""
     try:
-        client = anthropic.Anthropic(api_key=st.session_state.get('api_key', ''))
-        
         company_info = f"for {company_name}" if company_name else ""
         position_info = f"for the {position_title} position" if position_title else ""
         
@@ -250,13 +278,7 @@ Please write a professional cover letter that:
 
 Format it as a complete, ready-to-use cover letter."""
 
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return message.content[0].text
+        return call_claude("cover_letter", prompt, 2000, api_key=api_key, on_text=on_text)
     except Exception as e:
         return f"Error generating cover letter: {str(e)}"
 
@@ -273,10 +295,253 @@ def load_models():
         st.error("⚠️ Model files not found. Please run `python train_improved.py` first.")
         return None, None
 
+@st.cache_resource
+def get_keyword_simulator():
+    tfidf, clf = load_models()
+    if tfidf is None:
+        return None
+    return KeywordGainSimulator(tfidf)
+
+@st.cache_resource
+def get_keyword_gain_cache():
+    """Rankings keyed on the scorer's cleaned-text hashes, so reruns don't recompute them"""
+    return LRUCache("keyword_gain")
+
+def keyword_gains(resume_text, job_description, top_n=15):
+    """Missing JD terms ranked by the match-score gain of adding each once"""
+    scorer = get_scorer()
+    simulator = get_keyword_simulator()
+    if scorer is None or simulator is None:
+        return []
+    resume_key, _ = scorer.vectorize(resume_text)
+    jd_key, jd_vector = scorer.vectorize(job_description)
+    cache = get_keyword_gain_cache()
+    gains = cache.get((resume_key, jd_key, top_n))
+    if gains is None:
+        with metrics.stage("keyword_gain"):
+            gains = simulator.rank(clean_text(resume_text), jd_vector, top_n)
+        cache.put((resume_key, jd_key, top_n), gains)
+    return gains
+
+@st.cache_resource
+def get_explainer():
+    """Term-level explanations of the category and match score (inverse vocabulary built once)"""
+    tfidf, clf = load_models()
+    if tfidf is None or clf is None:
+        return None
+    return MatchExplainer(tfidf, clf)
+
+@st.cache_resource
+def get_scorer():
+    """Memoized TF-IDF scorer shared by every tab, rerun and session"""
+    tfidf, clf = load_models()
+    if tfidf is None or clf is None:
+        return None
+    return Scorer(tfidf, clf, clean_fn=clean_text)
+
+# ------------------------
+# Near-Duplicate Analysis Reuse
+# ------------------------
+@st.cache_resource
+def get_analysis_cache():
+    """ATS analyses per JD: near-identical resumes reuse them within a session,
+    identical ones across sessions (an analysis quotes its resume, so it mustn't leak)"""
+    return NearDuplicateCache()
+
+def recall_analysis(cache, session_id, resume_text, job_description):
+    analysis = cache.get(clean_text(resume_text), text_hash(clean_text(job_description)), session_id)
+    metrics.record_cache("near_duplicate_analysis", analysis is not None)
+    return analysis
+
+def remember_analysis(cache, session_id, resume_text, job_description, ats_analysis):
+    if not ats_analysis.startswith("Error"):
+        cache.put(clean_text(resume_text), text_hash(clean_text(job_description)), ats_analysis, session_id)
+
+# ------------------------
+# Session Artifacts
+# ------------------------
+@st.cache_resource
+def get_artifact_store():
+    """Bounded, compressed store shared by all sessions; session_state keeps only handles"""
+    return ArtifactStore()
+
+def set_artifact(name, value):
+    if value is None:
+        st.session_state.pop(name, None)
+    else:
+        st.session_state[name] = get_artifact_store().put(value)
+
+def get_artifact(name, default=None):
+    """Value behind a session's handle; default if unset or evicted"""
+    handle = st.session_state.get(name)
+    if handle is None:
+        return default
+    value = get_artifact_store().get(handle)
+    if value is None:
+        del st.session_state[name]  # evicted: forget the stale handle
+        return default
+    return value
+
+# ------------------------
+# Background Jobs
+# ------------------------
+@st.cache_resource
+def get_job_manager():
+    """Thread pool shared by all sessions so LLM calls don't block the script thread"""
+    return JobManager()
+
+def get_session_id():
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex
+    return st.session_state['session_id']
+
+def submit_job(kind, fn, *args, **kwargs):
+    """Start a background job for this session and remember its id across reruns"""
+    manager = get_job_manager()
+    # A new request supersedes the previous one of this kind; don't leave it running (and billed)
+    previous = get_session_job(kind)
+    if previous is not None and previous.is_active:
+        manager.cancel(previous.id)
+    try:
+        job = manager.submit(get_session_id(), kind, fn, *args, **kwargs)
+    except JobLimitError as e:
+        st.warning(f"⏳ {e}")
+        return None
+    st.session_state.setdefault('jobs', {})[kind] = job.id
+    return job
+
+def get_session_job(kind):
+    return get_job_manager().get(st.session_state.get('jobs', {}).get(kind))
+
+def render_job_status(kind, label):
+    """Show progress for an active job, or collect a finished one into session state.
+
+    Returns True while the job is still running.
+    """
+    job = get_session_job(kind)
+    if job is None:
+        return False
+    if job.is_active:
+        poll_job(kind, label)
+        return True
+    
+    del st.session_state['jobs'][kind]
+    get_job_manager().forget(job.id)
+    if job.trace is not None:
+        st.session_state['last_trace'] = job.trace
+    if job.status == DONE:
+        for name, value in job.result.items():
+            set_artifact(name, value)
+    elif job.status == FAILED:
+        st.error(f"❌ Job failed: {job.error}")
+    elif job.status == CANCELLED:
+        st.warning("✖ Cancelled")
+    return False
+
+@st.fragment(run_every=1.0)
+def poll_job(kind, label):
+    """Refresh only this block every second until the job finishes"""
+    job = get_session_job(kind)
+    if job is None or not job.is_active:
+        st.rerun()
+    
+    st.info(f"{job.message or '🔄 ' + label} ({job.elapsed:.0f}s)")
+    partial = job.partial
+    if partial:
+        with st.container(border=True, height=400):
+            st.markdown(partial)
+    if st.button("✖ Cancel", key=f"cancel_{kind}"):
+        get_job_manager().cancel(job.id)
+        st.rerun()
+
+def ats_analysis_job(job, resume_text, job_description, similarity_score, api_key, analysis_cache):
+    with metrics.track_request("ats_analysis") as trace:
+        job.trace = trace
+        job.message = "🤖 Getting AI-powered detailed analysis..."
+        ats_analysis = analyze_ats_score(resume_text, job_description, similarity_score, api_key=api_key, on_text=job.append)
+        remember_analysis(analysis_cache, job.session_id, resume_text, job_description, ats_analysis)
+    return {'ats_analysis': ats_analysis}
+
+def optimization_job(job, resume_text, job_description, ats_analysis, similarity_score, api_key, analysis_cache, priority_keywords):
+    with metrics.track_request("optimization") as trace:
+        job.trace = trace
+        result = {}
+        
+        # Need to run ATS analysis first
+        if ats_analysis is None:
+            job.reset_partial("📊 Running ATS analysis first...")
+            ats_analysis = analyze_ats_score(resume_text, job_description, similarity_score, api_key=api_key, on_text=job.append)
+            result['ats_analysis'] = ats_analysis
+            remember_analysis(analysis_cache, job.session_id, resume_text, job_description, ats_analysis)
+            job.check_cancelled()
+        
+        job.reset_partial("💡 Generating optimization suggestions...")
+        result['optimization'] = optimize_resume(
+            resume_text, job_description, ats_analysis,
+            api_key=api_key, on_text=job.append, priority_keywords=priority_keywords
+        )
+    return result
+
+def cover_letter_job(job, resume_text, job_description, company_name, position_title, api_key):
+    with metrics.track_request("cover_letter") as trace:
+        job.trace = trace
+        job.message = "✍️ Crafting your personalized cover letter..."
+        cover_letter = generate_cover_letter(
+            resume_text, job_description, company_name, position_title,
+            api_key=api_key, on_text=job.append
+        )
+    return {'cover_letter': cover_letter}
+
+def request_cover_letter_regeneration():
+    st.session_state['regenerate_cover_letter'] = True
+
+# ------------------------
+# Metrics Export
+# ------------------------
+@st.cache_resource
+def start_metrics_server():
+    """Expose /metrics once per process when METRICS_PORT is set"""
+    if metrics.METRICS_PORT:
+        return metrics.start_http_server(metrics.METRICS_PORT)
+    return None
+
+def render_debug_panel(trace):
+    """Show the stage-by-stage breakdown of the last request"""
+    stats = get_artifact_store().stats()
+    st.caption(
+        f"Session artifacts: {stats['entries']} in memory, {stats['bytes'] / 2**20:.1f} / "
+        f"{stats['max_bytes'] / 2**20:.0f} MB ({stats['codec']}, {stats['compression_ratio'] or 1:.1f}x), "
+        f"{stats['evictions']} evicted, {stats['disk_entries']} on disk"
+    )
+    if trace is None:
+        st.caption("No request timed yet in this session.")
+        return
+    st.markdown(f"**Last request:** `{trace.flow}` — {trace.total_seconds * 1000:.0f} ms")
+    p95 = metrics.REQUEST_SECONDS.quantile(0.95, flow=trace.flow)
+    if p95 is not None:
+        st.caption(
+            f"p95 over {metrics.REQUEST_SECONDS.count(flow=trace.flow)} `{trace.flow}` requests "
+            f"in this process: {p95 * 1000:.0f} ms"
+        )
+    st.dataframe(pd.DataFrame(trace.as_rows()), hide_index=True, use_container_width=True)
+    if trace.cache:
+        st.caption("Cache: " + ", ".join(f"{name} {result}" for name, result in trace.cache))
+    st.caption(f"LLM tokens: {trace.tokens['input']} in / {trace.tokens['output']} out")
+    if trace.errors:
+        st.caption("Errors: " + ", ".join(trace.errors))
+    st.download_button(
+        label="📥 Download metrics (Prometheus)",
+        data=metrics.REGISTRY.render(),
+        file_name="metrics.prom",
+        mime="text/plain",
+        use_container_width=True
+    )
+
 # ------------------------
 # Streamlit UI
 # ------------------------
 st.set_page_config(page_title="AI Resume Copilot", page_icon="🚀", layout="wide")
+start_metrics_server()
 
 # Custom CSS
 st.markdown("""
@@ -342,6 +607,11 @@ with st.sidebar:
     - Review AI suggestions
     - Customize outputs
     """)
+    
+    st.divider()
+    
+    show_debug_panel = st.checkbox("🐞 Show performance debug panel", help="Timing breakdown of the last request")
+    debug_panel = st.container()
 
 # Main content
 tab1, tab2, tab3, tab4 = st.tabs(["📝 Input", "📊 ATS Analysis", "✨ Resume Optimizer", "💌 Cover Letter"])
@@ -369,7 +639,7 @@ with tab1:
             if st.checkbox("Preview resume text"):
                 with st.spinner("Extracting text..."):
                     resume_text = extract_text_from_pdf(uploaded_file)
-                    st.session_state['resume_text'] = resume_text
+                    set_artifact('resume_text', resume_text)
                     st.text_area("Resume Preview", resume_text[:1000] + "...", height=200)
     
     with col2:
@@ -399,56 +669,65 @@ with tab1:
     )
     
     if input_method == "📝 Structured Input (Recommended)":
-        # Primary sections (most important)
-        st.markdown("### 🎯 Primary Sections (Required)")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            responsibilities = st.text_area(
-                "Key Responsibilities *",
-                placeholder="• Develop Python scripts...\n• Automate data collection...\n• Implement validation checks...",
-                height=250,
-                help="List the main responsibilities - this is critical for matching!"
-            )
-        
-        with col2:
-            requirements = st.text_area(
-                "Requirements *",
-                placeholder="• Bachelor's degree in IT...\n• Strong Python programming...\n• Logical approach to data...",
-                height=250,
-                help="List the required qualifications and skills - this is critical for matching!"
-            )
-        
-        # Secondary sections (optional)
-        st.markdown("### 📝 Additional Sections (Optional)")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            overview = st.text_area(
-                "Job Overview (Optional)",
-                placeholder="Brief description of the role and what you'll be doing...",
-                height=150,
-                help="Optional: Paste the job overview or write a summary of the role"
-            )
+        # Widgets inside a form don't rerun the script on every edit; their
+        # values only change when the form is submitted
+        with st.form("jd_form", border=False):
+            # Primary sections (most important)
+            st.markdown("### 🎯 Primary Sections (Required)")
+            col1, col2 = st.columns(2)
             
-        with col2:
-            preferred = st.text_area(
-                "Preferred Qualifications (Optional)",
-                placeholder="• Experience with APIs...\n• Familiarity with SQL...\n• Finance domain knowledge...",
-                height=150,
-                help="Optional: List preferred but not required qualifications"
-            )
+            with col1:
+                responsibilities = st.text_area(
+                    "Key Responsibilities *",
+                    placeholder="• Develop Python scripts...\n• Automate data collection...\n• Implement validation checks...",
+                    height=250,
+                    help="List the main responsibilities - this is critical for matching!"
+                )
+            
+            with col2:
+                requirements = st.text_area(
+                    "Requirements *",
+                    placeholder="• Bachelor's degree in IT...\n• Strong Python programming...\n• Logical approach to data...",
+                    height=250,
+                    help="List the required qualifications and skills - this is critical for matching!"
+                )
+            
+            # Secondary sections (optional)
+            st.markdown("### 📝 Additional Sections (Optional)")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                overview = st.text_area(
+                    "Job Overview (Optional)",
+                    placeholder="Brief description of the role and what you'll be doing...",
+                    height=150,
+                    help="Optional: Paste the job overview or write a summary of the role"
+                )
+                
+            with col2:
+                preferred = st.text_area(
+                    "Preferred Qualifications (Optional)",
+                    placeholder="• Experience with APIs...\n• Familiarity with SQL...\n• Finance domain knowledge...",
+                    height=150,
+                    help="Optional: List preferred but not required qualifications"
+                )
+            
+            st.form_submit_button("✅ Apply Job Description", use_container_width=True)
         
         # Combine into full job description
         if responsibilities.strip() or requirements.strip():
-            job_description = format_job_description(overview, responsibilities, requirements, preferred)
-            st.session_state['job_description'] = job_description
-            st.session_state['jd_components'] = {
+            components = {
                 'overview': overview,
                 'responsibilities': responsibilities,
                 'requirements': requirements,
                 'preferred': preferred
             }
+            # Only rebuild when a component actually changed (or the JD was evicted);
+            # the cleaned JD and its TF-IDF vector are derived lazily (and cached) by the scorer
+            if (artifact_handle(components) != st.session_state.get('jd_components')
+                    or not get_artifact_store().contains(st.session_state.get('job_description'))):
+                set_artifact('job_description', format_job_description(overview, responsibilities, requirements, preferred))
+                set_artifact('jd_components', components)
             
             # Show what's been filled
             filled_sections = []
@@ -464,8 +743,9 @@ with tab1:
             if filled_sections:
                 st.success(f"✓ Sections filled: {', '.join(filled_sections)}")
         else:
-            st.session_state['job_description'] = ""
-            st.warning("⚠️ Please fill at least Key Responsibilities or Requirements")
+            set_artifact('job_description', None)
+            set_artifact('jd_components', None)
+            st.warning("⚠️ Please fill at least Key Responsibilities or Requirements, then click Apply")
     else:
         job_description = st.text_area(
             "Full Job Description",
@@ -473,13 +753,14 @@ with tab1:
             height=400,
             help="Paste the entire job description as-is"
         )
-        st.session_state['job_description'] = job_description
-        st.session_state['jd_components'] = None
+        set_artifact('job_description', job_description)
+        set_artifact('jd_components', None)
     
-    # Preview formatted JD
-    if st.session_state.get('job_description', '').strip():
-        with st.expander("👁️ Preview Formatted Job Description"):
-            st.markdown(st.session_state['job_description'])
+    # Preview formatted JD (rendered only when asked for)
+    if get_artifact('job_description', '').strip():
+        if st.toggle("👁️ Preview Formatted Job Description"):
+            with st.container(border=True):
+                st.markdown(get_artifact('job_description', ''))
     
     # Validation
     st.divider()
@@ -493,9 +774,9 @@ with tab1:
             st.error("❌ Resume required")
     
     with col2:
-        jd_filled = st.session_state.get('job_description', '').strip()
+        jd_filled = get_artifact('job_description', '').strip()
         if input_method == "📝 Structured Input (Recommended)":
-            components = st.session_state.get('jd_components', {})
+            components = get_artifact('jd_components') or {}
             has_required = (components.get('responsibilities', '').strip() or 
                           components.get('requirements', '').strip())
             if has_required:
@@ -521,98 +802,149 @@ with tab2:
     st.header("📊 ATS Score Analysis")
     st.write("Comprehensive analysis of how well your resume matches the job description through ATS systems")
     
+    st.checkbox(
+        "🔄 Run a fresh analysis",
+        key="fresh_analysis",
+        help="Don't reuse an analysis of a near-identical resume from earlier in this session (e.g. after editing your resume)"
+    )
+    
     if st.button("🔍 Analyze ATS Score", type="primary", use_container_width=True):
-        if not uploaded_file or not st.session_state.get('job_description', '').strip():
+        job_description = get_artifact('job_description', '')
+        if not uploaded_file or not job_description.strip():
             st.error("⚠️ Please upload a resume and provide job description in the Input tab")
         elif not st.session_state.get('api_key'):
             st.error("🔑 Please enter your Anthropic API key in the sidebar")
         else:
-            with st.spinner("🔄 Analyzing your resume... This may take 15-30 seconds"):
+            with st.spinner("🔄 Scoring your resume..."), metrics.track_request("ats_scoring") as trace:
+                st.session_state['last_trace'] = trace
+                
                 # Load models
-                tfidf, clf = load_models()
+                with metrics.stage("load_models"):
+                    scorer = get_scorer()
                 
-                if tfidf is None or clf is None:
+                if scorer is None:
                     st.stop()
                 
                 # Extract and process resume
-                if 'resume_text' not in st.session_state:
+                resume_text = get_artifact('resume_text')
+                metrics.record_cache("resume_text", resume_text is not None)
+                if resume_text is None:
                     resume_text = extract_text_from_pdf(uploaded_file)
-                    st.session_state['resume_text'] = resume_text
-                else:
-                    resume_text = st.session_state['resume_text']
-                
-                clean_resume = clean_text(resume_text)
-                clean_jd = clean_text(st.session_state['job_description'])
-                
-                # Calculate similarity
-                resume_vector = tfidf.transform([clean_resume])
-                jd_vector = tfidf.transform([clean_jd])
-                similarity = cosine_similarity(resume_vector, jd_vector)[0][0]
-                predicted_category = clf.predict(resume_vector)[0]
-                
-                # Display basic metrics
-                st.subheader("📈 Quick Metrics")
-                col1, col2, col3 = st.columns(3)
+                    set_artifact('resume_text', resume_text)
                 
+                # Calculate similarity (memoized on the cleaned resume and JD)
+                match = scorer.score(resume_text, job_description)
+                with metrics.stage("explain"):
+                    explanation = get_explainer().explain(match.resume_vector, match.jd_vector, match.predicted_category)
+                st.session_state['ats_scores'] = {
+                    'similarity': match.similarity,
+                    'predicted_category': match.predicted_category,
+                    'explanation': explanation
+                }
+            
+                # Reuse the analysis of a near-identical resume against the same JD, unless asked not to
+                analysis_cache = get_analysis_cache()
+                cached_analysis = None
+                if not st.session_state.get('fresh_analysis'):
+                    cached_analysis = recall_analysis(analysis_cache, get_session_id(), resume_text, job_description)
+            
+            if cached_analysis is not None:
+                set_artifact('ats_analysis', cached_analysis)
+                st.info(
+                    "♻️ Reused the earlier analysis of a near-identical resume for this job description. "
+                    "If you've edited your resume since, tick **Run a fresh analysis** and analyze again."
+                )
+            else:
+                # Get detailed ATS analysis in the background
+                submit_job(
+                    "ats_analysis", ats_analysis_job,
+                    resume_text,
+                    job_description,
+                    match.similarity * 100,
+                    st.session_state['api_key'],
+                    analysis_cache
+                )
+    
+    if 'ats_scores' in st.session_state:
+        similarity = st.session_state['ats_scores']['similarity']
+        predicted_category = st.session_state['ats_scores']['predicted_category']
+        
+        # Display basic metrics
+        st.subheader("📈 Quick Metrics")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                "Initial Match Score", 
+                f"{similarity * 100:.1f}%",
+                help="TF-IDF similarity between resume and job description"
+            )
+        
+        with col2:
+            st.metric(
+                "Predicted Category", 
+                predicted_category,
+                help="ML model prediction of job category"
+            )
+        
+        with col3:
+            if similarity > 0.6:
+                status = "🟢 Strong Match"
+                delta = "Good"
+            elif similarity > 0.4:
+                status = "🟡 Fair Match"
+                delta = "Needs Work"
+            else:
+                status = "🔴 Weak Match"
+                delta = "Major Gaps"
+            st.metric("Match Status", status, delta)
+        
+        explanation = st.session_state['ats_scores'].get('explanation')
+        if explanation:
+            with st.expander("🔎 Why these numbers?"):
+                col1, col2 = st.columns(2)
                 with col1:
-                    st.metric(
-                        "Initial Match Score", 
-                        f"{similarity * 100:.1f}%",
-                        help="TF-IDF similarity between resume and job description"
+                    st.markdown("**Terms behind the match score**")
+                    shared = pd.DataFrame(explanation['shared_terms'], columns=['term', 'points', 'share'])
+                    shared['share'] *= 100
+                    st.dataframe(
+                        shared.rename(columns={'term': 'Keyword', 'points': 'Points', 'share': 'Share'}),
+                        hide_index=True,
+                        use_container_width=True,
+                        column_config={
+                            'Points': st.column_config.NumberColumn(format="%.2f"),
+                            'Share': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%")
+                        }
                     )
-                
                 with col2:
-                    st.metric(
-                        "Predicted Category", 
-                        predicted_category,
-                        help="ML model prediction of job category"
+                    st.markdown(f"**Terms pointing to {predicted_category}**")
+                    st.dataframe(
+                        pd.DataFrame(explanation['category_terms'], columns=['term', 'weight']).rename(
+                            columns={'term': 'Keyword', 'weight': 'Weight'}
+                        ),
+                        hide_index=True,
+                        use_container_width=True,
+                        column_config={'Weight': st.column_config.NumberColumn(format="%.3f")}
                     )
-                
-                with col3:
-                    if similarity > 0.6:
-                        status = "🟢 Strong Match"
-                        delta = "Good"
-                    elif similarity > 0.4:
-                        status = "🟡 Fair Match"
-                        delta = "Needs Work"
-                    else:
-                        status = "🔴 Weak Match"
-                        delta = "Major Gaps"
-                    st.metric("Match Status", status, delta)
-                
-                st.divider()
-                
-                # Get detailed ATS analysis
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                status_text.text("🤖 Getting AI-powered detailed analysis...")
-                progress_bar.progress(50)
-                
-                ats_analysis = analyze_ats_score(
-                    resume_text, 
-                    st.session_state['job_description'], 
-                    similarity * 100
-                )
-                
-                progress_bar.progress(100)
-                status_text.empty()
-                progress_bar.empty()
-                
-                st.session_state['ats_analysis'] = ats_analysis
-                
-                # Display analysis
-                st.subheader("🔍 Detailed ATS Analysis")
-                st.markdown(ats_analysis)
-                
-                # Download button
-                st.download_button(
-                    label="📥 Download Analysis Report",
-                    data=f"ATS ANALYSIS REPORT\n{'='*50}\n\n{ats_analysis}",
-                    file_name="ats_analysis_report.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
+        
+        st.divider()
+    
+    ats_running = render_job_status("ats_analysis", "Analyzing your resume... This may take 15-30 seconds")
+    
+    ats_analysis = None if ats_running else get_artifact('ats_analysis')
+    if ats_analysis is not None:
+        # Display analysis
+        st.subheader("🔍 Detailed ATS Analysis")
+        st.markdown(ats_analysis)
+        
+        # Download button
+        st.download_button(
+            label="📥 Download Analysis Report",
+            data=f"ATS ANALYSIS REPORT\n{'='*50}\n\n{ats_analysis}",
+            file_name="ats_analysis_report.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
 
 # ------------------------
 # TAB 3: Resume Optimizer
@@ -621,60 +953,90 @@ with tab3:
     st.header("✨ Resume Optimization")
     st.write("Get AI-powered, actionable suggestions to improve your resume based on the job description")
     
+    # Instant, local estimate of which missing keywords matter most
+    resume_text = get_artifact('resume_text')
+    job_description = get_artifact('job_description', '')
+    gains = []
+    if resume_text and job_description.strip():
+        gains = keyword_gains(resume_text, job_description)
+        if gains:
+            with st.expander("🎯 Keyword Impact Simulator"):
+                st.caption("Estimated change in the Initial Match Score from adding each missing job description term once")
+                st.dataframe(
+                    pd.DataFrame(gains).rename(columns={'term': 'Keyword', 'gain': 'Gain (pts)', 'new_score': 'New Score (%)'}),
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        'Gain (pts)': st.column_config.NumberColumn(format="+%.2f"),
+                        'New Score (%)': st.column_config.NumberColumn(format="%.1f")
+                    }
+                )
+    
     if st.button("🚀 Optimize My Resume", type="primary", use_container_width=True):
-        if not uploaded_file or not st.session_state.get('job_description', '').strip():
+        if not uploaded_file or not job_description.strip():
             st.error("⚠️ Please upload a resume and provide job description in the Input tab")
         elif not st.session_state.get('api_key'):
             st.error("🔑 Please enter your Anthropic API key in the sidebar")
         else:
-            with st.spinner("🔄 Analyzing and optimizing your resume... This may take 30-45 seconds"):
+            with st.spinner("🔄 Preparing your resume..."), metrics.track_request("optimization_prep") as trace:
+                st.session_state['last_trace'] = trace
+                
                 # Check if we already have ATS analysis
-                if 'ats_analysis' not in st.session_state or 'resume_text' not in st.session_state:
-                    # Need to run ATS analysis first
-                    tfidf, clf = load_models()
-                    
-                    if tfidf is None or clf is None:
-                        st.stop()
-                    
+                ats_analysis = get_artifact('ats_analysis')
+                has_analysis = ats_analysis is not None and resume_text is not None
+                metrics.record_cache("ats_analysis", has_analysis)
+                similarity = None
+                analysis_cache = get_analysis_cache()
+                if not has_analysis:
                     resume_text = extract_text_from_pdf(uploaded_file)
-                    clean_resume = clean_text(resume_text)
-                    clean_jd = clean_text(st.session_state['job_description'])
-                    
-                    resume_vector = tfidf.transform([clean_resume])
-                    jd_vector = tfidf.transform([clean_jd])
-                    similarity = cosine_similarity(resume_vector, jd_vector)[0][0]
+                    set_artifact('resume_text', resume_text)
                     
-                    st.info("📊 Running ATS analysis first...")
-                    ats_analysis = analyze_ats_score(resume_text, st.session_state['job_description'], similarity * 100)
-                    st.session_state['ats_analysis'] = ats_analysis
-                    st.session_state['resume_text'] = resume_text
-                
-                # Get optimization suggestions
-                st.info("💡 Generating optimization suggestions...")
-                optimization = optimize_resume(
-                    st.session_state['resume_text'],
-                    st.session_state['job_description'],
-                    st.session_state['ats_analysis']
-                )
-                
-                st.session_state['optimization'] = optimization
-                
-                st.success("✅ Optimization complete!")
-                st.divider()
-                
-                st.subheader("💡 Personalized Optimization Suggestions")
-                st.markdown(optimization)
-                
-                # Download button
-                st.download_button(
-                    label="📥 Download Optimization Guide",
-                    data=f"RESUME OPTIMIZATION GUIDE\n{'='*50}\n\n{optimization}",
-                    file_name="resume_optimization_guide.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-                
-                st.info("💡 **Next Steps**: Review the suggestions above, update your resume, then re-run the ATS analysis to see your improved score!")
+                    if not st.session_state.get('fresh_analysis'):
+                        ats_analysis = recall_analysis(analysis_cache, get_session_id(), resume_text, job_description)
+                    if ats_analysis is not None:
+                        set_artifact('ats_analysis', ats_analysis)
+                        has_analysis = True
+                    else:
+                        # The job will run ATS analysis first, which needs the match score
+                        with metrics.stage("load_models"):
+                            scorer = get_scorer()
+                        
+                        if scorer is None:
+                            st.stop()
+                        
+                        similarity = scorer.score(resume_text, job_description).similarity
+            
+            submit_job(
+                "optimization", optimization_job,
+                resume_text,
+                job_description,
+                ats_analysis if has_analysis else None,
+                similarity * 100 if similarity is not None else None,
+                st.session_state['api_key'],
+                analysis_cache,
+                [gain['term'] for gain in (gains or keyword_gains(resume_text, job_description))[:10]]
+            )
+    
+    optimization_running = render_job_status("optimization", "Analyzing and optimizing your resume... This may take 30-45 seconds")
+    
+    optimization = None if optimization_running else get_artifact('optimization')
+    if optimization is not None:
+        st.success("✅ Optimization complete!")
+        st.divider()
+        
+        st.subheader("💡 Personalized Optimization Suggestions")
+        st.markdown(optimization)
+        
+        # Download button
+        st.download_button(
+            label="📥 Download Optimization Guide",
+            data=f"RESUME OPTIMIZATION GUIDE\n{'='*50}\n\n{optimization}",
+            file_name="resume_optimization_guide.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+        
+        st.info("💡 **Next Steps**: Review the suggestions above, update your resume, then re-run the ATS analysis with **Run a fresh analysis** ticked to see your improved score!")
 
 # ------------------------
 # TAB 4: Cover Letter Generator
@@ -687,58 +1049,73 @@ with tab4:
     if st.session_state.get('company_name') or st.session_state.get('position_title'):
         st.info(f"**Position**: {st.session_state.get('position_title', 'Not specified')} at {st.session_state.get('company_name', 'Not specified')}")
     
-    if st.button("✍️ Generate Cover Letter", type="primary", use_container_width=True):
-        if not uploaded_file or not st.session_state.get('job_description', '').strip():
+    generate_clicked = st.button("✍️ Generate Cover Letter", type="primary", use_container_width=True)
+    if st.session_state.pop('regenerate_cover_letter', False):
+        generate_clicked = True
+    
+    if generate_clicked:
+        job_description = get_artifact('job_description', '')
+        if not uploaded_file or not job_description.strip():
             st.error("⚠️ Please upload a resume and provide job description in the Input tab")
         elif not st.session_state.get('api_key'):
             st.error("🔑 Please enter your Anthropic API key in the sidebar")
         else:
-            with st.spinner("🔄 Crafting your personalized cover letter... This may take 20-30 seconds"):
-                if 'resume_text' not in st.session_state:
+            resume_text = get_artifact('resume_text')
+            metrics.record_cache("resume_text", resume_text is not None)
+            if resume_text is None:
+                with st.spinner("🔄 Reading your resume..."):
                     resume_text = extract_text_from_pdf(uploaded_file)
-                    st.session_state['resume_text'] = resume_text
-                
-                cover_letter = generate_cover_letter(
-                    st.session_state['resume_text'],
-                    st.session_state['job_description'],
-                    st.session_state.get('company_name', ''),
-                    st.session_state.get('position_title', '')
-                )
-                
-                st.session_state['cover_letter'] = cover_letter
-                
-                st.success("✅ Cover letter generated successfully!")
-                st.divider()
-                
-                # Display cover letter
-                st.subheader("📝 Your Personalized Cover Letter")
-                
-                # Editable text area
-                edited_letter = st.text_area(
-                    "Review and edit your cover letter:",
-                    value=cover_letter,
-                    height=500,
-                    help="Feel free to edit and personalize further"
-                )
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.download_button(
-                        label="📥 Download as TXT",
-                        data=edited_letter,
-                        file_name=f"cover_letter_{st.session_state.get('company_name', 'job').replace(' ', '_')}.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
-                
-                with col2:
-                    if st.button("🔄 Regenerate", use_container_width=True):
-                        st.rerun()
-                
-                st.divider()
-                
-                st.success("💡 **Pro Tip**: Always review and personalize the cover letter before sending. Add specific details about why you're excited about this particular company and role!")
+                    set_artifact('resume_text', resume_text)
+            
+            submit_job(
+                "cover_letter", cover_letter_job,
+                resume_text,
+                job_description,
+                st.session_state.get('company_name', ''),
+                st.session_state.get('position_title', ''),
+                st.session_state['api_key']
+            )
+    
+    cover_letter_running = render_job_status("cover_letter", "Crafting your personalized cover letter... This may take 20-30 seconds")
+    
+    cover_letter = None if cover_letter_running else get_artifact('cover_letter')
+    if cover_letter is not None:
+        st.success("✅ Cover letter generated successfully!")
+        st.divider()
+        
+        # Display cover letter
+        st.subheader("📝 Your Personalized Cover Letter")
+        
+        # Editable text area
+        edited_letter = st.text_area(
+            "Review and edit your cover letter:",
+            value=cover_letter,
+            height=500,
+            help="Feel free to edit and personalize further"
+        )
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.download_button(
+                label="📥 Download as TXT",
+                data=edited_letter,
+                file_name=f"cover_letter_{st.session_state.get('company_name', 'job').replace(' ', '_')}.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
+        
+        with col2:
+            st.button("🔄 Regenerate", use_container_width=True, on_click=request_cover_letter_regeneration)
+        
+        st.divider()
+        
+        st.success("💡 **Pro Tip**: Always review and personalize the cover letter before sending. Add specific details about why you're excited about this particular company and role!")
+
+# Debug panel is filled last so it reflects a request made during this run
+if show_debug_panel:
+    with debug_panel:
+        render_debug_panel(st.session_state.get('last_trace'))
 
 # Footer
 st.divider()
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+import metrics
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is used when zstandard isn't installed
+    zstandard = None
+
+# ------------------------
+# Configuration
+# ------------------------
+ARTIFACT_MAX_BYTES = int(os.environ.get("ARTIFACT_MAX_BYTES", str(256 * 1024 * 1024)))
+ARTIFACT_SPILL_DIR = os.environ.get("ARTIFACT_SPILL_DIR") or None
+ARTIFACT_MAX_DISK_BYTES = int(os.environ.get("ARTIFACT_MAX_DISK_BYTES", str(2 * 1024 * 1024 * 1024)))
+COMPRESS_MIN_BYTES = 512  # smaller payloads aren't worth the codec call
+ENTRY_OVERHEAD = 160  # approximate bytes of dict slot, key and tuple per entry
+
+_TEXT, _JSON = b"s", b"j"
+_RAW, _ZLIB, _ZSTD = b"n", b"z", b"Z"
+
+# ------------------------
+# Encoding
+# ------------------------
+def _serialize(value):
+    """(kind, payload) for a str or JSON-serializable value"""
+    if isinstance(value, str):
+        return _TEXT, value.encode("utf-8")
+    return _JSON, json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def artifact_handle(value):
+    """Content-addressed handle; identical values share one stored copy"""
+    kind, payload = _serialize(value)
+    return hashlib.sha256(kind + payload).hexdigest()[:32]
+
+class _Codec:
+    # zstandard (de)compressor objects aren't thread-safe, so one is made per call
+
+    def __init__(self):
+        self.tag = _ZSTD if zstandard is not None else _ZLIB
+
+    def compress(self, payload):
+        if self.tag == _ZSTD:
+            return zstandard.ZstdCompressor(level=3).compress(payload)
+        return zlib.compress(payload, 6)
+
+    def decompress(self, tag, data):
+        if tag == _ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Artifact was compressed with zstd but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if tag == _ZLIB:
+            return zlib.decompress(data)
+        return data
+
+# ------------------------
+# Artifact Store
+# ------------------------
+class ArtifactStore:
+    """Bounded, compressed store for large per-session values.
+
+    Sessions keep only the handle returned by ``put``. Stored bytes
+    (compressed payload plus a fixed per-entry overhead) never exceed
+    ``max_bytes``: the least recently used entries are evicted, or written
+    to ``spill_dir`` when one is configured and read back on their next
+    ``get``. Spilled files are themselves capped at ``max_disk_bytes``.
+    ``get`` returns None for a handle whose value was evicted for good.
+    """
+
+    def __init__(self, max_bytes=ARTIFACT_MAX_BYTES, spill_dir=ARTIFACT_SPILL_DIR,
+                 max_disk_bytes=ARTIFACT_MAX_DISK_BYTES, compress_min_bytes=COMPRESS_MIN_BYTES):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.codec = _Codec()
+        self._memory = OrderedDict()  # handle -> (blob, raw_size)
+        self._disk = OrderedDict()  # handle -> (size, raw_size)
+        self._bytes = 0
+        self._raw_bytes = 0
+        self._disk_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0, "spills": 0, "dropped": 0}
+        self._lock = threading.Lock()
+        self.spill_dir = None
+        if spill_dir:
+            # A private directory per store, so cleanup never touches anyone else's files
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix="artifacts-", dir=spill_dir)
+
+    def put(self, value):
+        kind, payload = _serialize(value)
+        handle = hashlib.sha256(kind + payload).hexdigest()[:32]
+        with self._lock:
+            if handle in self._memory:
+                self._memory.move_to_end(handle)
+                return handle
+            if handle in self._disk:
+                return handle
+
+        if len(payload) >= self.compress_min_bytes:
+            blob = kind + self.codec.tag + self.codec.compress(payload)
+        else:
+            blob = kind + _RAW + payload
+
+        with self._lock:
+            # Another thread may have stored the same value while this one compressed
+            if handle not in self._memory and handle not in self._disk:
+                self._insert(handle, blob, len(payload))
+        return handle
+
+    def get(self, handle):
+        if handle is None:
+            return None
+        with self._lock:
+            entry = self._memory.get(handle)
+            if entry is not None:
+                self._memory.move_to_end(handle)
+                self._stats["hits"] += 1
+            elif handle in self._disk:
+                entry = self._read_spilled(handle)
+                self._stats["disk_hits"] += 1
+            else:
+                self._stats["misses"] += 1
+        metrics.record_cache("session_artifact", entry is not None)
+        if entry is None:
+            return None
+        blob = entry[0]
+        payload = self.codec.decompress(blob[1:2], blob[2:])
+        if blob[:1] == _TEXT:
+            return payload.decode("utf-8")
+        return json.loads(payload)
+
+    def contains(self, handle):
+        with self._lock:
+            return handle in self._memory or handle in self._disk
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                self._stats,
+                entries=len(self._memory),
+                bytes=self._bytes,
+                raw_bytes=self._raw_bytes,
+                max_bytes=self.max_bytes,
+                compression_ratio=self._raw_bytes / self._bytes if self._bytes else None,
+                disk_entries=len(self._disk),
+                disk_bytes=self._disk_bytes,
+                codec="zstd" if self.codec.tag == _ZSTD else "zlib",
+            )
+
+    def close(self):
+        """Drop every entry and delete the spill directory"""
+        with self._lock:
+            self._memory.clear()
+            self._disk.clear()
+            self._bytes = self._raw_bytes = self._disk_bytes = 0
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    # Internals (caller holds the lock) ----------------------------------
+    def _insert(self, handle, blob, raw_size):
+        size = len(blob) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            # Can never fit in memory: straight to disk, or not kept at all
+            if self.spill_dir:
+                self._spill(handle, blob, raw_size)
+            else:
+                self._stats["dropped"] += 1
+            return
+        self._memory[handle] = (blob, raw_size)
+        self._bytes += size
+        self._raw_bytes += raw_size
+        while self._bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        handle, (blob, raw_size) = self._memory.popitem(last=False)
+        self._bytes -= len(blob) + ENTRY_OVERHEAD
+        self._raw_bytes -= raw_size
+        self._stats["evictions"] += 1
+        if self.spill_dir:
+            self._spill(handle, blob, raw_size)
+        else:
+            self._stats["dropped"] += 1
+
+    def _spill_path(self, handle):
+        return os.path.join(self.spill_dir, f"{handle}.bin")
+
+    def _spill(self, handle, blob, raw_size):
+        path = self._spill_path(handle)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError:
+            metrics.record_error("artifact_spill")
+            self._stats["dropped"] += 1
+            return
+        self._disk[handle] = (len(blob), raw_size)
+        self._disk_bytes += len(blob)
+        self._stats["spills"] += 1
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            oldest, (size, _) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._stats["dropped"] += 1
+            try:
+                os.remove(self._spill_path(oldest))
+            except OSError:
+                pass
+
+    def _read_spilled(self, handle):
+        """Load a spilled entry back into memory; None if the file is gone"""
+        size, raw_size = self._disk.pop(handle)
+        self._disk_bytes -= size
+        path = self._spill_path(handle)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            os.remove(path)
+        except OSError:
+            metrics.record_error("artifact_spill")
+            return None
+        self._insert(handle, blob, raw_size)
+        return blob, raw_size
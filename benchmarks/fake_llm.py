@@ -0,0 +1,150 @@
+"""Local stand-in for the Anthropic Messages API.
+
+Answers ``POST /v1/messages`` with a canned assistant message after a
+configurable delay, so LLM flows can be benchmarked offline and
+deterministically. Point the app at it with ``ANTHROPIC_BASE_URL``.
+
+    python -m benchmarks.fake_llm --port 8089 --latency 0.5
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILLER = (
+    "Overall ATS Score: 72/100. Keyword matching is solid for Python and SQL, "
+    "but the resume lacks evidence of ETL pipelines and API integration. "
+)
+
+class FakeAnthropicHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # avoid ~40 ms delayed-ACK stalls skewing flow timings
+
+    def do_POST(self):
+        if self.path.split("?")[0] != "/v1/messages":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+
+        prompt = "".join(
+            m["content"] if isinstance(m["content"], str) else json.dumps(m["content"])
+            for m in request.get("messages", [])
+        )
+        input_tokens = max(1, len(prompt) // 4)
+        output_tokens = min(request.get("max_tokens", server.response_tokens), server.response_tokens)
+
+        time.sleep(server.latency)
+
+        words = (FILLER * (output_tokens // 20 + 1)).split()[:output_tokens]
+        message = {
+            "id": f"msg_fake_{server.next_id()}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "fake-model"),
+            "content": [{"type": "text", "text": " ".join(words)}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+        }
+        if request.get("stream"):
+            self._stream(message, words, server.per_token_latency)
+            return
+
+        time.sleep(output_tokens * server.per_token_latency)
+        body = json.dumps(message).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, message, words, per_token_latency, chunk_words=20):
+        """Send the reply as server-sent events, as ``client.messages.stream`` expects"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(event, data):
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            start = dict(message, content=[], stop_reason=None)
+            start["usage"] = dict(message["usage"], output_tokens=0)
+            send("message_start", {"type": "message_start", "message": start})
+            send("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+            for i in range(0, len(words), chunk_words):
+                time.sleep(len(words[i:i + chunk_words]) * per_token_latency)
+                text = (" " if i else "") + " ".join(words[i:i + chunk_words])
+                send("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}})
+            send("content_block_stop", {"type": "content_block_stop", "index": 0})
+            send("message_delta", {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                "usage": {"output_tokens": message["usage"]["output_tokens"]},
+            })
+            send("message_stop", {"type": "message_stop"})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client stopped reading, e.g. a cancelled call
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeAnthropicServer(ThreadingHTTPServer):
+    """Threaded fake API server; ``latency`` and ``per_token_latency`` are seconds"""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, per_token_latency=0.0, response_tokens=400):
+        super().__init__((host, port), FakeAnthropicHandler)
+        self.latency = latency
+        self.per_token_latency = per_token_latency
+        self.response_tokens = response_tokens
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_id(self):
+        with self._lock:
+            self.requests_served += 1
+            return self.requests_served
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name="fake-anthropic", daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Anthropic Messages API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.5, help="Fixed delay per call (seconds)")
+    parser.add_argument("--per-token-latency", type=float, default=0.0, help="Extra delay per output token (seconds)")
+    parser.add_argument("--response-tokens", type=int, default=400, help="Output tokens per reply")
+    args = parser.parse_args()
+
+    server = FakeAnthropicServer(args.host, args.port, args.latency, args.per_token_latency, args.response_tokens)
+    print(f"Fake Anthropic API listening on {server.base_url} (set ANTHROPIC_BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
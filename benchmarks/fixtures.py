@@ -0,0 +1,90 @@
+"""Deterministic inputs for the benchmark suite: corpus samples, a sample
+job description and generated text PDFs."""
+import io
+import random
+
+import pandas as pd
+
+DATA_PATH = "data/resume.csv"
+
+SAMPLE_JOB_DESCRIPTION = """**Key Responsibilities:**
+• Develop Python scripts to extract data from vendor back-office systems
+• Automate data collection, parsing, and normalization for reconciliation purposes
+• Implement validation checks to identify missing, duplicated, or mismatched data
+• Support finance reporting by providing structured and accurate datasets
+
+**Requirements:**
+• Diploma or Bachelor's degree in IT, Computer Science, or related fields
+• Strong academic foundation in Python programming
+• Familiarity with SQL or structured data formats (CSV, JSON)"""
+
+def load_resumes(data_path=DATA_PATH):
+    df = pd.read_csv(data_path)
+    return df['Resume'].dropna().astype(str).tolist()
+
+def sample_resumes(resumes, n, seed=42):
+    """Reproducible sample (with replacement when n exceeds the corpus)"""
+    rng = random.Random(seed)
+    if n <= len(resumes):
+        return rng.sample(resumes, n)
+    return [rng.choice(resumes) for _ in range(n)]
+
+# ------------------------
+# PDF Generation
+# ------------------------
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _wrap(text, width=90):
+    words = text.encode("latin-1", "replace").decode("latin-1").split()
+    lines, current = [], ""
+    for word in words:
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+    return lines
+
+def make_pdf(text, lines_per_page=55):
+    """Build a minimal text PDF (Helvetica, one content stream per page)"""
+    lines = _wrap(text) or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects = []  # object bodies; object number = index + 1
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(None)  # page tree, filled once kids are known
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    kids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in page_lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_offset = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return out.getvalue()
@@ -0,0 +1,144 @@
+"""Load test for the headless scoring service (service.py).
+
+Drives ``POST /score`` from N concurrent keep-alive clients and reports
+throughput plus p50/p99 latency per concurrency level:
+
+    python -m benchmarks.load_test --spawn --workers 4 --concurrency 1 8 32 128
+
+Without ``--spawn`` it targets an already running service at ``--url``.
+"""
+import argparse
+import http.client
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from benchmarks import fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def percentile(ordered, q):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+def wait_until_healthy(host, port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/healthz")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Service at {host}:{port} did not become healthy within {timeout}s")
+
+def run_level(host, port, bodies, concurrency, duration):
+    """Run ``concurrency`` clients for ``duration`` seconds; return summary stats"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(worker_index):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local, failed, i = [], 0, worker_index
+        while time.monotonic() < stop_at:
+            body = bodies[i % len(bodies)]
+            i += concurrency
+            start = time.perf_counter()
+            try:
+                conn.request("POST", "/score", body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            local.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    ordered = sorted(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": len(ordered),
+        "errors": errors[0],
+        "throughput_rps": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000 if ordered else None,
+        "p99_ms": percentile(ordered, 0.99) * 1000 if ordered else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scoring service")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="Start service.py for the duration of the test")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes when spawning")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument("--sample", type=int, default=200, help="Distinct resumes to cycle through")
+    parser.add_argument("--data", default=str(ROOT / fixtures.DATA_PATH))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    target = urlparse(args.url)
+    host, port = target.hostname, target.port or 80
+
+    resumes = fixtures.sample_resumes(fixtures.load_resumes(args.data), args.sample)
+    bodies = [
+        json.dumps({"resume": resume, "job_description": fixtures.SAMPLE_JOB_DESCRIPTION}).encode("utf-8")
+        for resume in resumes
+    ]
+
+    process = None
+    if args.spawn:
+        process = subprocess.Popen(
+            [sys.executable, "service.py", "--host", host, "--port", str(port),
+             "--workers", str(args.workers), "--max-batch-size", str(args.max_batch_size),
+             "--max-wait-ms", str(args.max_wait_ms)],
+            cwd=ROOT
+        )
+    try:
+        wait_until_healthy(host, port)
+        results = []
+        print(f"\n{'concurrency':>11}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        print("-" * 59)
+        for concurrency in args.concurrency:
+            result = run_level(host, port, bodies, concurrency, args.duration)
+            results.append(result)
+            p50 = f"{result['p50_ms']:10.2f}" if result["p50_ms"] is not None else f"{'-':>10}"
+            p99 = f"{result['p99_ms']:10.2f}" if result["p99_ms"] is not None else f"{'-':>10}"
+            print(f"{concurrency:>11}{result['requests']:>10}{result['errors']:>8}{result['throughput_rps']:>10.1f}{p50}{p99}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"url": args.url, "levels": results}, indent=2))
+        print(f"\n✓ Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
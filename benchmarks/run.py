@@ -0,0 +1,337 @@
+"""End-to-end benchmark suite for app.py and train.py hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.run                    # run and compare with baseline.json
+    python -m benchmarks.run --quick            # fewer repeats, smaller samples (see below)
+    python -m benchmarks.run --update-baseline  # store current results as the baseline
+
+Results are written as JSON; any benchmark whose best (minimum) time is
+slower than the baseline by more than ``--threshold`` is reported as a
+regression and makes the command exit non-zero. The minimum is compared
+rather than the median because it is the least sensitive to scheduler
+noise. Baselines are machine-specific, so refresh them when the benchmark
+host changes.
+
+A run whose sample sizes differ from the baseline's is refused (exit 2),
+so ``--quick`` only compares against a baseline stored with
+``--quick --update-baseline --baseline <path>``; against baseline.json it
+is just a fast look at the numbers.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+RESULTS_PATH = Path(__file__).resolve().parent / "results" / "latest.json"
+
+# ------------------------
+# Timing Helpers
+# ------------------------
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def summarize(samples, items=1):
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    median = statistics.median(ordered)
+    return {
+        "median_s": median,
+        "mean_s": statistics.fmean(ordered),
+        "min_s": ordered[0],
+        "p95_s": ordered[p95_index],
+        "repeat": len(ordered),
+        "items": items,
+        "items_per_s": items / median if median > 0 else None,
+    }
+
+# ------------------------
+# App Import
+# ------------------------
+def import_app():
+    """Import app.py headlessly; Streamlit runs it in bare mode with no-op widgets"""
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    warnings.filterwarnings("ignore")
+    from streamlit import config, logger
+    config.get_config_options()  # load config first so it can't reset the level below
+    logger.set_log_level("error")  # silence bare-mode "missing ScriptRunContext" warnings
+    import app
+    return app
+
+# ------------------------
+# Benchmarks
+# ------------------------
+def bench_clean_text(clean_text, resumes, repeat):
+    def run():
+        for text in resumes:
+            clean_text(text)
+    return summarize(measure(run, repeat), items=len(resumes))
+
+def bench_extract_pdf(app, pdfs, repeat):
+    def run():
+        for data in pdfs:
+            app.extract_text_from_pdf(io.BytesIO(data))
+    return summarize(measure(run, repeat), items=len(pdfs))
+
+def bench_load_models(app, repeat):
+    def run():
+        app.load_models.clear()
+        app.load_models()
+    return summarize(measure(run, repeat, warmup=0))
+
+def bench_similarity_single(app, resumes, job_description, repeat):
+    """The ATS tab's scoring path (app.get_scorer), with its caches cleared first"""
+    scorer = app.get_scorer()
+
+    def run():
+        scorer.clear()
+        for text in resumes:
+            scorer.score(text, job_description)
+    return summarize(measure(run, repeat), items=len(resumes))
+
+def bench_similarity_batch(app, resumes, job_description, repeat):
+    tfidf, clf = app.load_models()
+
+    def run():
+        resume_matrix = tfidf.transform([app.clean_text(text) for text in resumes])
+        jd_vector = tfidf.transform([app.clean_text(job_description)])
+        cosine_similarity(resume_matrix, jd_vector)
+        clf.predict(resume_matrix)
+    return summarize(measure(run, repeat), items=len(resumes))
+
+def bench_similarity_memoized(app, resumes, job_description, repeat):
+    """Repeat scoring of already-seen pairs, as happens on Streamlit reruns"""
+    from scoring import Scorer
+    tfidf, clf = app.load_models()
+    scorer = Scorer(tfidf, clf, clean_fn=app.clean_text, maxsize=len(resumes))
+
+    def run():
+        for text in resumes:
+            scorer.score(text, job_description)
+    return summarize(measure(run, repeat), items=len(resumes))
+
+def bench_explain(app, resumes, job_description, repeat):
+    """Per-resume term explanation of the category and match score"""
+    from explain import MatchExplainer
+    tfidf, clf = app.load_models()
+    explainer = MatchExplainer(tfidf, clf)
+    resume_matrix = tfidf.transform([app.clean_text(text) for text in resumes])
+    jd_vector = tfidf.transform([app.clean_text(job_description)])
+    categories = clf.predict(resume_matrix)
+    rows = [resume_matrix[i] for i in range(len(resumes))]
+
+    def run():
+        for row, category in zip(rows, categories):
+            explainer.explain(row, jd_vector, category)
+    return summarize(measure(run, repeat), items=len(resumes))
+
+def bench_flow(app, name, pdf, job_description, repeat):
+    """Full button handler path: PDF → scoring via the app's Scorer → the
+    streaming ``*_job`` function run through the app's JobManager"""
+    from jobs import DONE
+
+    scorer = app.get_scorer()
+    explainer = app.get_explainer()
+    manager = app.get_job_manager()
+    analysis_cache = app.get_analysis_cache()
+    api_key = app.st.session_state['api_key']
+
+    def score(resume_text):
+        match = scorer.score(resume_text, job_description)
+        explainer.explain(match.resume_vector, match.jd_vector, match.predicted_category)
+        return match.similarity
+
+    def run_job(fn, *args):
+        job = manager.submit("benchmark", name, fn, *args)
+        job.future.result()
+        manager.forget(job.id)
+        if job.status != DONE:
+            raise RuntimeError(job.error or f"{name} job ended as {job.status}")
+        for value in job.result.values():
+            if value.startswith("Error"):
+                raise RuntimeError(value)
+
+    def run():
+        scorer.clear()
+        app.get_keyword_gain_cache().clear()
+        resume_text = app.extract_text_from_pdf(io.BytesIO(pdf))
+        if name == "ats":
+            run_job(app.ats_analysis_job, resume_text, job_description, score(resume_text) * 100, api_key, analysis_cache)
+        elif name == "optimize":
+            # Optimizing before any analysis: the job runs the ATS analysis first
+            keywords = [gain['term'] for gain in app.keyword_gains(resume_text, job_description)[:10]]
+            run_job(
+                app.optimization_job, resume_text, job_description, None, score(resume_text) * 100,
+                api_key, analysis_cache, keywords
+            )
+        else:
+            run_job(app.cover_letter_job, resume_text, job_description, "Acme", "Data Programmer", api_key)
+    return summarize(measure(run, repeat))
+
+def run_suite(args):
+    app = import_app()
+    import train
+    from benchmarks import fixtures
+    from benchmarks.fake_llm import FakeAnthropicServer
+
+    corpus = fixtures.load_resumes(args.data)
+    resumes = fixtures.sample_resumes(corpus, args.sample)
+    pdfs = [fixtures.make_pdf(text) for text in fixtures.sample_resumes(corpus, args.pdfs, seed=7)]
+    jd = fixtures.SAMPLE_JOB_DESCRIPTION
+    repeat = args.repeat
+
+    results = {}
+    results["clean_text_corpus"] = bench_clean_text(app.clean_text, corpus, repeat)
+    results["train_clean_text_corpus"] = bench_clean_text(train.clean_text, corpus, repeat)
+    results["extract_text_from_pdf"] = bench_extract_pdf(app, pdfs, repeat)
+    results["load_models_cold"] = bench_load_models(app, repeat)
+    results["similarity_single"] = bench_similarity_single(app, resumes, jd, repeat)
+    results["similarity_batch"] = bench_similarity_batch(app, resumes, jd, repeat)
+    results["similarity_memoized"] = bench_similarity_memoized(app, resumes, jd, repeat)
+    results["explain"] = bench_explain(app, resumes, jd, repeat)
+
+    server = FakeAnthropicServer(latency=args.llm_latency, response_tokens=args.llm_tokens).start()
+    os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+    app.st.session_state['api_key'] = "benchmark-key"
+    try:
+        for flow in ("ats", "optimize", "cover_letter"):
+            results[f"flow_{flow}"] = bench_flow(app, flow, pdfs[0], jd, args.flow_repeat)
+    finally:
+        server.stop()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sample": args.sample,
+            "pdfs": args.pdfs,
+            "repeat": repeat,
+            "llm_latency_s": args.llm_latency,
+            "llm_tokens": args.llm_tokens,
+        },
+        "benchmarks": results,
+    }
+
+# ------------------------
+# Baseline Comparison
+# ------------------------
+COMPARABLE_META = ("sample", "pdfs", "llm_latency_s", "llm_tokens")
+
+def meta_mismatch(current, baseline):
+    """Settings that change what a benchmark measures and differ from the baseline's"""
+    return [
+        f"{key}={current['meta'].get(key)} (baseline {baseline.get('meta', {}).get(key)})"
+        for key in COMPARABLE_META
+        if current["meta"].get(key) != baseline.get("meta", {}).get(key)
+    ]
+
+def compare(current, baseline, threshold):
+    """Return (rows, regressions) comparing best-of-N times per benchmark"""
+    rows, regressions = [], []
+    for name, result in current["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            rows.append((name, result["min_s"], None, None, "new"))
+            continue
+        ratio = result["min_s"] / base["min_s"] if base["min_s"] else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        rows.append((name, result["min_s"], base["min_s"], ratio, verdict))
+    return rows, regressions
+
+def print_report(current, rows):
+    print(f"\n{'benchmark':<26}{'best':>12}{'baseline':>12}{'ratio':>8}  verdict")
+    print("-" * 70)
+    for name, best, base, ratio, verdict in rows:
+        base_text = f"{base * 1000:9.2f} ms" if base is not None else f"{'-':>12}"
+        ratio_text = f"{ratio:7.2f}x" if ratio is not None else f"{'-':>8}"
+        print(f"{name:<26}{best * 1000:9.2f} ms{base_text}{ratio_text}  {verdict}")
+    for name, result in current["benchmarks"].items():
+        if result["items"] > 1:
+            print(f"  {name}: {result['items_per_s']:.1f} items/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the AI Resume Copilot benchmark suite")
+    parser.add_argument("--data", default="data/resume.csv")
+    parser.add_argument("--sample", type=int, default=200, help="Resumes for similarity benchmarks")
+    parser.add_argument("--pdfs", type=int, default=10, help="Generated PDFs to extract")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--flow-repeat", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM delay per call (seconds)")
+    parser.add_argument("--llm-tokens", type=int, default=400, help="Fake LLM output tokens per call")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--output", default=str(RESULTS_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--quick", action="store_true",
+        help="Small samples for a fast smoke run (only comparable with a --quick baseline)"
+    )
+    args = parser.parse_args()
+
+    if args.quick:
+        args.sample, args.pdfs, args.repeat, args.flow_repeat = 50, 3, 2, 1
+
+    current = run_suite(args)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(current, indent=2))
+    print(f"✓ Results written to {output}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(current, indent=2))
+        print(f"✓ Baseline updated at {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        rows, regressions = compare(current, {}, args.threshold)
+        print_report(current, rows)
+        print("\nNo baseline found; run with --update-baseline to store one.")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    mismatch = meta_mismatch(current, baseline)
+    if mismatch:
+        rows, _ = compare(current, {}, args.threshold)
+        print_report(current, rows)
+        print(f"\n⚠️  Not comparable with the baseline: {', '.join(mismatch)}")
+        print("Rerun with the baseline's settings, or use --update-baseline to record new ones.")
+        return 2
+
+    rows, regressions = compare(current, baseline, args.threshold)
+    print_report(current, rows)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
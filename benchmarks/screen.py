@@ -0,0 +1,67 @@
+"""Offline end-to-end run of the cascade screening pipeline (cascade.py).
+
+Screens a sample of the corpus against the sample job description: TF-IDF
+filtering first, then ATS analysis for the survivors through
+``app.analyze_ats_score`` against a local fake Anthropic server.
+
+    python -m benchmarks.screen --sample 500 --min-similarity 0.25 --top-fraction 0.1 \\
+        --token-budget 60000 --time-budget 20 --llm-latency 0.5
+"""
+import argparse
+import functools
+import json
+import os
+from pathlib import Path
+
+from benchmarks import fixtures
+from benchmarks.fake_llm import FakeAnthropicServer
+from benchmarks.run import import_app, ROOT
+
+def main():
+    parser = argparse.ArgumentParser(description="Run cascade screening offline against a fake LLM")
+    parser.add_argument("--data", default=str(ROOT / fixtures.DATA_PATH))
+    parser.add_argument("--sample", type=int, default=300, help="Resumes to screen")
+    parser.add_argument("--min-similarity", type=float, default=0.3)
+    parser.add_argument("--top-fraction", type=float, help="Keep only the best fraction of all candidates (e.g. 0.1)")
+    parser.add_argument("--category", action="append", help="Allowed predicted category (repeatable)")
+    parser.add_argument("--token-budget", type=int, help="Total LLM tokens (input + output)")
+    parser.add_argument("--time-budget", type=float, help="Seconds allowed for the LLM stage")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM delay per call (seconds)")
+    parser.add_argument("--per-token-latency", type=float, default=0.001, help="Fake LLM delay per output token")
+    parser.add_argument("--llm-tokens", type=int, default=800, help="Fake LLM output tokens per call")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    app = import_app()
+    from cascade import CascadeScreener, format_report
+
+    resumes = fixtures.sample_resumes(fixtures.load_resumes(args.data), args.sample)
+    tfidf, clf = app.load_models()
+
+    server = FakeAnthropicServer(
+        latency=args.llm_latency, per_token_latency=args.per_token_latency, response_tokens=args.llm_tokens
+    ).start()
+    os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+    try:
+        screener = CascadeScreener(
+            tfidf, clf,
+            functools.partial(app.analyze_ats_score, api_key="benchmark-key"),
+            min_similarity=args.min_similarity,
+            top_fraction=args.top_fraction,
+            categories=args.category,
+            token_budget=args.token_budget,
+            time_budget=args.time_budget,
+            concurrency=args.concurrency,
+        )
+        report = screener.run(resumes, fixtures.SAMPLE_JOB_DESCRIPTION)
+    finally:
+        server.stop()
+
+    print(format_report(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\n✓ Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Soak test for the session artifact store (artifacts.py).
+
+Simulates many Streamlit sessions, each storing a resume, a (shared) job
+description, its components and three LLM outputs, then revisiting
+earlier sessions at random from several threads. Checks that the store
+never exceeds its byte bound and reports memory, compression, eviction
+and hit-rate figures:
+
+    python -m benchmarks.soak_sessions --sessions 5000 --max-mb 32
+    python -m benchmarks.soak_sessions --sessions 5000 --max-mb 8 --spill-dir /tmp/artifacts
+
+Exits non-zero if the bound is ever exceeded or a read returns the wrong value.
+"""
+import argparse
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+from benchmarks import fixtures
+from benchmarks.run import ROOT
+
+ARTIFACTS = ("resume_text", "job_description", "jd_components", "ats_analysis", "optimization", "cover_letter")
+
+def rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def session_values(session_id, corpus, job_descriptions, rng):
+    """The artifacts one session accumulates; LLM outputs are unique per session"""
+    resume = f"{rng.choice(corpus)}\nCandidate reference {session_id}"
+    jd_index = rng.randrange(len(job_descriptions))
+
+    def llm_output(title, words):
+        sample = " ".join(rng.choice(corpus).split()[:words])
+        return f"## {title} for session {session_id}\n\n{sample}"
+
+    return {
+        "resume_text": resume,
+        "job_description": job_descriptions[jd_index],
+        "jd_components": {"responsibilities": job_descriptions[jd_index], "requirements": "", "index": jd_index},
+        "ats_analysis": llm_output("ATS Analysis", 900),
+        "optimization": llm_output("Optimization", 1200),
+        "cover_letter": llm_output("Cover Letter", 400),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the bounded session artifact store")
+    parser.add_argument("--sessions", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--revisits", type=int, default=3, help="Random reads of earlier sessions per new session")
+    parser.add_argument("--max-mb", type=float, default=32.0, help="Artifact store bound")
+    parser.add_argument("--spill-dir", help="Spill evicted artifacts here instead of dropping them")
+    parser.add_argument("--max-disk-mb", type=float, default=256.0)
+    parser.add_argument("--data", default=str(ROOT / fixtures.DATA_PATH))
+    args = parser.parse_args()
+
+    from artifacts import ArtifactStore, artifact_handle
+
+    corpus = fixtures.load_resumes(args.data)
+    job_descriptions = [f"{fixtures.SAMPLE_JOB_DESCRIPTION}\n• Team {i}" for i in range(20)]
+    store = ArtifactStore(
+        max_bytes=int(args.max_mb * 1024 * 1024),
+        spill_dir=args.spill_dir,
+        max_disk_bytes=int(args.max_disk_mb * 1024 * 1024),
+    )
+
+    tracemalloc.start()
+    baseline_rss = rss_mb()
+    sessions = {}  # session id -> {artifact: handle}, what session_state would hold
+    lock = threading.Lock()
+    counters = {"raw_bytes": 0, "reads": 0, "found": 0, "wrong": 0, "bound_violations": 0}
+    next_session = iter(range(args.sessions))
+
+    def worker(seed):
+        rng = random.Random(seed)
+        while True:
+            with lock:
+                session_id = next(next_session, None)
+            if session_id is None:
+                return
+            values = session_values(session_id, corpus, job_descriptions, rng)
+            handles = {}
+            raw = 0
+            for name, value in values.items():
+                handles[name] = store.put(value)
+                raw += len(str(value))
+            with lock:
+                sessions[session_id] = handles
+                counters["raw_bytes"] += raw
+                known = list(sessions)
+
+            # Revisit earlier sessions, biased towards recent ones like real traffic
+            for _ in range(args.revisits):
+                other = known[min(len(known) - 1, int(len(known) * (1 - rng.random() ** 3)))]
+                name = rng.choice(ARTIFACTS)
+                handle = sessions[other][name]
+                value = store.get(handle)
+                with lock:
+                    counters["reads"] += 1
+                    if value is not None:
+                        counters["found"] += 1
+                        # Handles are content hashes, so re-hashing the value verifies it
+                        if artifact_handle(value) != handle:
+                            counters["wrong"] += 1
+
+            stats = store.stats()
+            if stats["bytes"] > stats["max_bytes"]:
+                with lock:
+                    counters["bound_violations"] += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = store.stats()
+    store.close()
+
+    print(f"\n{args.sessions} sessions x {len(ARTIFACTS)} artifacts on {args.threads} threads in {elapsed:.1f}s")
+    print(f"  Raw artifact bytes written:  {counters['raw_bytes'] / 2**20:9.1f} MB (unbounded session_state would hold this)")
+    print(f"  Store in memory:             {stats['bytes'] / 2**20:9.1f} MB of {stats['max_bytes'] / 2**20:.0f} MB "
+          f"({stats['entries']} entries, {stats['codec']} {stats['compression_ratio'] or 1:.1f}x)")
+    print(f"  Spilled to disk:             {stats['disk_bytes'] / 2**20:9.1f} MB ({stats['disk_entries']} entries)")
+    print(f"  Evictions / spills / dropped: {stats['evictions']} / {stats['spills']} / {stats['dropped']}")
+    print(f"  Revisit hit rate:            {counters['found'] / max(1, counters['reads']):9.1%} "
+          f"({stats['disk_hits']} served from disk)")
+    print(f"  Python heap peak (traced):   {traced_peak / 2**20:9.1f} MB")
+    print(f"  Process peak RSS:            {rss_mb():9.1f} MB (started at {baseline_rss:.1f} MB)")
+
+    failed = counters["bound_violations"] or counters["wrong"]
+    if counters["bound_violations"]:
+        print(f"\n❌ Store exceeded its bound {counters['bound_violations']} time(s)")
+    if counters["wrong"]:
+        print(f"\n❌ {counters['wrong']} read(s) returned the wrong value")
+    if not failed:
+        print("\n✅ Bound held and every read returned the stored value")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import argparse
+import functools
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+import metrics
+from jobs import JobCancelled
+from train import clean_text
+
+# ------------------------
+# Configuration
+# ------------------------
+DEFAULT_MIN_SIMILARITY = 0.3
+ATS_MAX_TOKENS = 2500  # max_tokens analyze_ats_score requests
+PROMPT_OVERHEAD_TOKENS = 600  # the ATS prompt template around the resume and JD
+CHARS_PER_TOKEN = 4
+PRICE_PER_MTOK_INPUT = 3.0  # USD, Claude Sonnet
+PRICE_PER_MTOK_OUTPUT = 15.0
+
+ANALYZED = "analyzed"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+FILTERED_CATEGORY = "filtered_category"
+FILTERED_THRESHOLD = "filtered_threshold"
+FILTERED_RANK = "filtered_rank"
+SKIPPED_TOKENS = "skipped_token_budget"
+SKIPPED_TIME = "skipped_time_budget"
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def llm_cost(input_tokens, output_tokens):
+    return (input_tokens * PRICE_PER_MTOK_INPUT + output_tokens * PRICE_PER_MTOK_OUTPUT) / 1_000_000
+
+# ------------------------
+# Cascade Screening
+# ------------------------
+class CascadeScreener:
+    """Screen many resumes against one JD, calling the LLM only for the best.
+
+    Stage 1 scores every resume with one TF-IDF transform, cosine similarity
+    and ``clf.predict``, then drops candidates outside ``categories``, below
+    ``min_similarity`` or outside the top ``top_fraction``. Stage 2 runs
+    ``analyze_fn`` on the survivors, best first, with up to ``concurrency``
+    calls in flight. A call only starts if its estimated worst-case token
+    cost (prompt estimate plus ``max_output_tokens``) fits in what is left of
+    ``token_budget``; once ``time_budget`` seconds have passed no new call
+    starts and running ones are cancelled at their next streamed chunk.
+
+    Spent tokens come from each response's reported usage. The prompt
+    estimate (chars / 4) is scaled by the largest actual-to-estimated input
+    ratio seen so far, so a low estimate is corrected after the first
+    responses, but the calls dispatched before that can still overshoot the
+    budget; the report's ``tokens_over_budget`` says by how much.
+
+    ``analyze_fn(resume_text, job_description, similarity_pct, on_text=...)``
+    matches ``app.analyze_ats_score``.
+    """
+
+    def __init__(self, tfidf, clf, analyze_fn, clean_fn=clean_text,
+                 min_similarity=DEFAULT_MIN_SIMILARITY, top_fraction=None, categories=None,
+                 token_budget=None, time_budget=None, concurrency=4, max_output_tokens=ATS_MAX_TOKENS):
+        if top_fraction is not None and not 0 < top_fraction <= 1:
+            raise ValueError("top_fraction must be in (0, 1]")
+        self.tfidf = tfidf
+        self.clf = clf
+        self.analyze_fn = analyze_fn
+        self.clean_fn = clean_fn
+        self.min_similarity = min_similarity
+        self.top_fraction = top_fraction
+        self.categories = set(categories) if categories else None
+        self.token_budget = token_budget
+        self.time_budget = time_budget
+        self.concurrency = max(1, concurrency)
+        self.max_output_tokens = max_output_tokens
+
+    def run(self, resumes, job_description, ids=None):
+        """Screen ``resumes``; returns a report dict (see ``format_report``)"""
+        start = time.perf_counter()
+        ids = list(ids) if ids is not None else list(range(len(resumes)))
+        candidates = [
+            {"id": candidate_id, "resume": resume, "status": None, "analysis": None,
+             "input_tokens": 0, "output_tokens": 0}
+            for candidate_id, resume in zip(ids, resumes)
+        ]
+
+        with metrics.track_request("cascade_screen"):
+            stage_start = time.perf_counter()
+            survivors = self._filter(candidates, job_description)
+            filter_seconds = time.perf_counter() - stage_start
+
+            stage_start = time.perf_counter()
+            input_scale = self._analyze_all(survivors, job_description)
+            llm_seconds = time.perf_counter() - stage_start
+
+        return self._report(candidates, filter_seconds, llm_seconds, time.perf_counter() - start, input_scale)
+
+    # Stage 1 ------------------------------------------------------------
+    def _filter(self, candidates, job_description):
+        if not candidates:
+            return []
+        with metrics.stage("cascade_tfidf"):
+            resume_matrix = self.tfidf.transform([self.clean_fn(c["resume"]) for c in candidates])
+            jd_vector = self.tfidf.transform([self.clean_fn(job_description)])
+            similarities = cosine_similarity(resume_matrix, jd_vector).ravel()
+        with metrics.stage("cascade_classify"):
+            categories = self.clf.predict(resume_matrix)
+
+        survivors = []
+        for candidate, similarity, category in zip(candidates, similarities, categories):
+            candidate["similarity"] = float(similarity)
+            candidate["predicted_category"] = str(category)
+            if self.categories is not None and candidate["predicted_category"] not in self.categories:
+                candidate["status"] = FILTERED_CATEGORY
+            elif similarity < self.min_similarity:
+                candidate["status"] = FILTERED_THRESHOLD
+            else:
+                survivors.append(candidate)
+
+        survivors.sort(key=lambda c: c["similarity"], reverse=True)
+        if self.top_fraction is not None:
+            keep = math.ceil(len(candidates) * self.top_fraction)
+            for candidate in survivors[keep:]:
+                candidate["status"] = FILTERED_RANK
+            survivors = survivors[:keep]
+        return survivors
+
+    # Stage 2 ------------------------------------------------------------
+    def _prompt_tokens(self, candidate, job_description):
+        """Estimated input tokens of one call, before correction"""
+        return estimate_tokens(candidate["resume"]) + estimate_tokens(job_description) + PROMPT_OVERHEAD_TOKENS
+
+    def _analyze_one(self, candidate, job_description, deadline, input_estimate):
+        streamed = []
+
+        def on_text(text):
+            streamed.append(text)
+            if deadline is not None and time.monotonic() > deadline:
+                raise JobCancelled()
+
+        with metrics.track_request("cascade_llm") as trace:
+            try:
+                analysis = self.analyze_fn(
+                    candidate["resume"], job_description, candidate["similarity"] * 100, on_text=on_text
+                )
+                status = FAILED if analysis.startswith("Error") else ANALYZED
+            except JobCancelled:
+                analysis, status = None, TIMED_OUT
+        tokens = dict(trace.tokens)
+        if status == TIMED_OUT:
+            # An aborted stream never reports usage; the input was still billed
+            tokens = {
+                "input": input_estimate,
+                "output": estimate_tokens("".join(streamed)),
+            }
+        return analysis, status, tokens
+
+    def _analyze_all(self, survivors, job_description):
+        deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+        pending = deque(survivors)
+        in_flight = {}
+        spent = reserved = 0
+        input_scale = 1.0  # largest actual / estimated input tokens seen
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="cascade-llm") as executor:
+            while pending or in_flight:
+                if deadline is not None and time.monotonic() > deadline:
+                    while pending:
+                        pending.popleft()["status"] = SKIPPED_TIME
+
+                while pending and len(in_flight) < self.concurrency:
+                    input_estimate = math.ceil(self._prompt_tokens(pending[0], job_description) * input_scale)
+                    cost = input_estimate + self.max_output_tokens
+                    if self.token_budget is not None and spent + reserved + cost > self.token_budget:
+                        if in_flight:
+                            break  # running calls may come in under their reservation
+                        pending.popleft()["status"] = SKIPPED_TOKENS
+                        continue
+                    candidate = pending.popleft()
+                    reserved += cost
+                    future = executor.submit(self._analyze_one, candidate, job_description, deadline, input_estimate)
+                    in_flight[future] = (candidate, cost)
+
+                if not in_flight:
+                    continue
+                # Wake at the deadline to stop dispatching; after it, just wait for cancellations
+                remaining = deadline - time.monotonic() if deadline is not None else 0
+                timeout = remaining if remaining > 0 else None
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    candidate, cost = in_flight.pop(future)
+                    reserved -= cost
+                    try:
+                        analysis, status, tokens = future.result()
+                    except Exception as e:
+                        metrics.record_error("cascade_llm")
+                        analysis, status, tokens = f"Error analyzing ATS score: {e}", FAILED, {"input": 0, "output": 0}
+                    candidate.update(
+                        analysis=analysis, status=status,
+                        input_tokens=tokens["input"], output_tokens=tokens["output"]
+                    )
+                    spent += tokens["input"] + tokens["output"]
+                    if status != TIMED_OUT and tokens["input"]:
+                        # Reconcile the estimate with the usage the API reported
+                        actual_ratio = tokens["input"] / self._prompt_tokens(candidate, job_description)
+                        input_scale = max(input_scale, actual_ratio)
+        return input_scale
+
+    # Report -------------------------------------------------------------
+    def _report(self, candidates, filter_seconds, llm_seconds, wall_seconds, input_scale):
+        def count(*statuses):
+            return sum(1 for c in candidates if c["status"] in statuses)
+
+        screened = len(candidates)
+        filtered = count(FILTERED_CATEGORY, FILTERED_THRESHOLD, FILTERED_RANK)
+        input_tokens = sum(c["input_tokens"] for c in candidates)
+        output_tokens = sum(c["output_tokens"] for c in candidates)
+        over_budget = 0
+        if self.token_budget is not None:
+            over_budget = max(0, input_tokens + output_tokens - self.token_budget)
+        return {
+            "stages": [
+                {
+                    "stage": "tfidf_filter",
+                    "input": screened,
+                    "eliminated": filtered,
+                    "reasons": {
+                        "category": count(FILTERED_CATEGORY),
+                        "below_threshold": count(FILTERED_THRESHOLD),
+                        "outside_top": count(FILTERED_RANK),
+                    },
+                    "seconds": filter_seconds,
+                },
+                {
+                    "stage": "llm_analysis",
+                    "input": screened - filtered,
+                    "eliminated": count(SKIPPED_TOKENS, SKIPPED_TIME, TIMED_OUT, FAILED),
+                    "reasons": {
+                        "token_budget": count(SKIPPED_TOKENS),
+                        "time_budget": count(SKIPPED_TIME, TIMED_OUT),
+                        "failed": count(FAILED),
+                    },
+                    "seconds": llm_seconds,
+                },
+            ],
+            "analyzed": count(ANALYZED),
+            "llm_calls": count(ANALYZED, FAILED, TIMED_OUT),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "token_budget": self.token_budget,
+            "tokens_over_budget": over_budget,
+            "input_estimate_scale": input_scale,
+            "cost_usd": llm_cost(input_tokens, output_tokens),
+            "wall_seconds": wall_seconds,
+            "candidates": [
+                {key: value for key, value in c.items() if key != "resume"}
+                for c in sorted(candidates, key=lambda c: c.get("similarity", 0.0), reverse=True)
+            ],
+        }
+
+def format_report(report):
+    lines = [f"{'stage':<16}{'in':>7}{'out':>7}{'seconds':>10}  eliminated by"]
+    lines.append("-" * 70)
+    for stage in report["stages"]:
+        reasons = ", ".join(f"{name}={n}" for name, n in stage["reasons"].items() if n) or "-"
+        lines.append(
+            f"{stage['stage']:<16}{stage['input']:>7}{stage['input'] - stage['eliminated']:>7}"
+            f"{stage['seconds']:>10.2f}  {reasons}"
+        )
+    lines.append(
+        f"\n{report['llm_calls']} LLM call(s), {report['input_tokens']:,} input + "
+        f"{report['output_tokens']:,} output tokens ≈ ${report['cost_usd']:.4f}; "
+        f"wall time {report['wall_seconds']:.2f}s"
+    )
+    if report["tokens_over_budget"]:
+        lines.append(
+            f"⚠️ {report['tokens_over_budget']:,} tokens over the {report['token_budget']:,} token budget "
+            f"(prompt estimates were low by up to {report['input_estimate_scale']:.2f}x)"
+        )
+    return "\n".join(lines)
+
+# ------------------------
+# Command Line
+# ------------------------
+def load_resumes(path, text_column="Resume", id_column=None):
+    """(ids, texts) from a CSV, or from the .pdf / .txt files in a directory"""
+    path = Path(path)
+    if path.is_dir():
+        from PyPDF2 import PdfReader
+
+        ids, texts = [], []
+        for file in sorted(path.iterdir()):
+            if file.suffix.lower() == ".pdf":
+                text = "".join(page.extract_text() or "" for page in PdfReader(file).pages)
+            elif file.suffix.lower() == ".txt":
+                text = file.read_text(errors="ignore")
+            else:
+                continue
+            ids.append(file.name)
+            texts.append(text)
+        return ids, texts
+
+    df = pd.read_csv(path)
+    if text_column not in df.columns:
+        raise ValueError(f"{path} has no '{text_column}' column")
+    df = df.dropna(subset=[text_column])
+    ids = df[id_column].tolist() if id_column else df.index.tolist()
+    return ids, df[text_column].astype(str).tolist()
+
+def _import_app():
+    """Import app.py headlessly for ``load_models`` and ``analyze_ats_score``"""
+    from streamlit import config, logger
+    config.get_config_options()
+    logger.set_log_level("error")  # bare mode warns about the missing ScriptRunContext
+    import app
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen many resumes against one job description")
+    parser.add_argument("resumes", help="CSV of resumes, or a directory of .pdf / .txt resumes")
+    parser.add_argument("job_description", help="Text file with the job description")
+    parser.add_argument("--text-column", default="Resume", help="Resume text column of a CSV")
+    parser.add_argument("--id-column", help="Candidate id column of a CSV (default: row number)")
+    parser.add_argument("--min-similarity", type=float, default=DEFAULT_MIN_SIMILARITY)
+    parser.add_argument("--top-fraction", type=float, help="Keep only the best fraction of all candidates (e.g. 0.1)")
+    parser.add_argument("--category", action="append", help="Allowed predicted category (repeatable)")
+    parser.add_argument("--token-budget", type=int, help="Total LLM tokens (input + output)")
+    parser.add_argument("--time-budget", type=float, help="Seconds allowed for the LLM stage")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--api-key", help="Anthropic API key (default: ANTHROPIC_API_KEY)")
+    parser.add_argument("--fake-llm", action="store_true", help="Run against a local fake Anthropic server (no key, no cost)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    ids, resumes = load_resumes(args.resumes, args.text_column, args.id_column)
+    job_description = Path(args.job_description).read_text()
+    api_key = args.api_key or os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key and not args.fake_llm:
+        parser.error("an API key is required: pass --api-key, set ANTHROPIC_API_KEY, or use --fake-llm")
+
+    app = _import_app()
+    tfidf, clf = app.load_models()
+    if tfidf is None:
+        print("⚠️ Model files not found. Run `python train.py` first.")
+        return 1
+
+    server = None
+    if args.fake_llm:
+        from benchmarks.fake_llm import FakeAnthropicServer
+
+        server = FakeAnthropicServer().start()
+        os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+        api_key = "fake-llm-key"
+    try:
+        screener = CascadeScreener(
+            tfidf, clf,
+            functools.partial(app.analyze_ats_score, api_key=api_key),
+            min_similarity=args.min_similarity,
+            top_fraction=args.top_fraction,
+            categories=args.category,
+            token_budget=args.token_budget,
+            time_budget=args.time_budget,
+            concurrency=args.concurrency,
+        )
+        report = screener.run(resumes, job_description, ids)
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(format_report(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, default=str))
+        print(f"\n✓ Report written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import hashlib
+import inspect
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# ------------------------
+# Configuration
+# ------------------------
+CACHE_DIR = os.path.join("data", ".cache")
+CHUNK_SIZE = 1024 * 1024
+
+# ------------------------
+# Cache Keys
+# ------------------------
+def file_digest(path):
+    """sha256 of the file contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def function_fingerprint(fn, version=None):
+    """Identify a cleaning function by its explicit version and its source code.
+
+    Hashing the source means an edited function invalidates the cache even
+    if nobody remembers to bump the version.
+    """
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = f"{fn.__module__}.{fn.__qualname__}"
+    return hashlib.sha256(f"{version}\n{source}".encode("utf-8")).hexdigest()
+
+def cache_key(data_path, clean_fn, version=None):
+    return hashlib.sha256(
+        f"{file_digest(data_path)}:{function_fingerprint(clean_fn, version)}".encode("utf-8")
+    ).hexdigest()[:16]
+
+# ------------------------
+# Cleaned Corpus Cache
+# ------------------------
+class CorpusCache:
+    """Cleaned training corpus stored as an uncompressed Arrow IPC file.
+
+    Each entry is named after the source file hash and the cleaning function
+    fingerprint, so a changed CSV or changed cleaning code simply misses and
+    is rebuilt. Reads memory-map the file: Arrow buffers are used in place
+    rather than parsed, and the DataFrame columns are Arrow-backed.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, key):
+        return self.cache_dir / f"corpus-{key}.arrow"
+
+    def load(self, key):
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                table = ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid):
+            return None  # truncated or corrupt entry: rebuild it
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def store(self, key, df):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        path = self.path_for(key)
+        # Write then rename so an interrupted run never leaves a half-written entry
+        tmp_path = path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        self.prune(keep=path)
+        return path
+
+    def prune(self, keep):
+        """Remove stale entries left by earlier data or cleaning versions"""
+        for stale in self.cache_dir.glob("corpus-*.arrow"):
+            if stale != keep:
+                stale.unlink(missing_ok=True)
+
+def load_clean_corpus(data_path, load_fn, clean_fn, version=None, cache_dir=CACHE_DIR,
+                      text_column="Resume", clean_column="clean_resume", columns=("Category",)):
+    """Return (df, hit): cleaned text plus label columns, from cache when possible.
+
+    ``load_fn(data_path)`` reads and validates the raw data; it only runs on
+    a cache miss.
+    """
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"Dataset not found at {data_path}")
+
+    cache = CorpusCache(cache_dir)
+    key = cache_key(data_path, clean_fn, version)
+    df = cache.load(key)
+    if df is not None:
+        return df, True
+
+    raw = load_fn(data_path)
+    df = pd.DataFrame({column: raw[column].values for column in columns})
+    df[clean_column] = raw[text_column].apply(clean_fn).values
+    cache.store(key, df)
+    # Reload so hits and misses hand back the same Arrow-backed frame
+    return cache.load(key), False
@@ -0,0 +1,209 @@
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+# ------------------------
+# Configuration
+# ------------------------
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: a pair shares a bucket with p = 1 - (1 - J^8)^16, ~95% at J=0.8, ~61% at 0.7
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+SEED = 42
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32, so a*h + b fits in uint64
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# ------------------------
+# MinHash
+# ------------------------
+def shingles(clean_text, k=SHINGLE_SIZE):
+    """Word k-grams of already-cleaned text (short texts yield one shingle)"""
+    words = clean_text.split()
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+class MinHasher:
+    """Universal-hash MinHash signatures (a*h + b mod p), vectorized with numpy"""
+
+    def __init__(self, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=SEED):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, clean_text):
+        grams = shingles(clean_text, self.shingle_size)
+        if not grams:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # crc32 is stable across processes, unlike hash(), so signatures can be persisted
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME
+        return permuted.min(axis=0)
+
+def estimate_jaccard(sig_a, sig_b):
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+# ------------------------
+# LSH Index
+# ------------------------
+class LSHIndex:
+    """Banded LSH over MinHash signatures.
+
+    Each signature is split into ``bands`` slices; documents sharing any
+    slice land in the same bucket. Insertion and lookup are O(bands) dict
+    operations, so indexing n documents is linear rather than comparing
+    all n^2 pairs. Candidates are confirmed against ``threshold`` using
+    the signature-estimated Jaccard similarity.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS, hasher=None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = hasher or MinHasher(num_perm)
+        self._buckets = [defaultdict(set) for _ in range(bands)]
+        self._signatures = {}
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key, signature):
+        self._signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket[band_key].add(key)
+
+    def remove(self, key):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            members = bucket.get(band_key)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del bucket[band_key]
+
+    def candidates(self, signature):
+        found = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            found.update(bucket.get(band_key, ()))
+        return found
+
+    def query(self, signature):
+        """Keys of indexed documents at or above the threshold, most similar first"""
+        matches = []
+        for key in self.candidates(signature):
+            similarity = estimate_jaccard(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((similarity, key))
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return [key for _, key in matches]
+
+    def __len__(self):
+        return len(self._signatures)
+
+# ------------------------
+# Corpus Deduplication
+# ------------------------
+def find_duplicate_clusters(clean_texts, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """Group near-duplicate documents; returns clusters (lists of positions) of size > 1.
+
+    Exact copies are folded onto their first occurrence by digest. Only
+    documents that match no earlier representative are indexed, so each one
+    is checked against one representative per cluster rather than every
+    copy in its bucket. Clusters matched by the same document are merged
+    with union-find.
+    """
+    index = LSHIndex(threshold, num_perm, bands)
+    parent = list(range(len(clean_texts)))
+    first_seen = {}  # text digest -> position of its first occurrence
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for position, text in enumerate(clean_texts):
+        digest = _text_digest(text)
+        if digest in first_seen:
+            parent[position] = find(first_seen[digest])
+            continue
+        first_seen[digest] = position
+
+        signature = index.hasher.signature(text)
+        matches = index.query(signature)
+        for match in matches:
+            root_a, root_b = find(position), find(match)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        if not matches:
+            index.insert(position, signature)
+
+    clusters = defaultdict(list)
+    for position in range(len(clean_texts)):
+        clusters[find(position)].append(position)
+    return [members for members in clusters.values() if len(members) > 1]
+
+# ------------------------
+# Near-Duplicate Result Cache
+# ------------------------
+class NearDuplicateCache:
+    """Reuse results (e.g. an ATS analysis) for resumes that are near-identical
+    to one already processed against the same job description.
+
+    Results quote the resume they were produced for, so a near-duplicate is
+    only reused for the ``owner`` (session) that stored it; other owners
+    need an exact match of the cleaned text.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, maxsize=1024):
+        self.index = LSHIndex(threshold)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (owner, text hash, {context_key: value})
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def get(self, clean_resume, context_key, owner):
+        signature = self.index.hasher.signature(clean_resume)
+        digest = _text_digest(clean_resume)
+        with self._lock:
+            for key in self.index.query(signature):
+                entry_owner, entry_digest, values = self._entries[key]
+                if entry_owner != owner and entry_digest != digest:
+                    continue
+                value = values.get(context_key)
+                if value is not None:
+                    return value
+        return None
+
+    def put(self, clean_resume, context_key, value, owner):
+        signature = self.index.hasher.signature(clean_resume)
+        digest = _text_digest(clean_resume)
+        with self._lock:
+            key = next(
+                (k for k in self.index.query(signature)
+                 if self._entries[k][0] == owner and self._entries[k][1] == digest),
+                None
+            )
+            if key is None:
+                key = self._next_key
+                self._next_key += 1
+                self.index.insert(key, signature)
+                self._entries[key] = (owner, digest, {})
+                # Evict the oldest resume once full
+                while len(self._entries) > self.maxsize:
+                    oldest, _ = self._entries.popitem(last=False)
+                    self.index.remove(oldest)
+            self._entries[key][2][context_key] = value
+
+def _text_digest(clean_text):
+    return hashlib.sha256(clean_text.encode("utf-8")).hexdigest()
@@ -0,0 +1,83 @@
+import numpy as np
+
+# ------------------------
+# Configuration
+# ------------------------
+DEFAULT_TOP_N = 10
+
+def inverse_vocabulary(tfidf):
+    """Feature index -> term array, built once from the fitted vocabulary"""
+    terms = np.empty(len(tfidf.vocabulary_), dtype=object)
+    for term, index in tfidf.vocabulary_.items():
+        terms[index] = term
+    return terms
+
+def _top(values, top_n):
+    """Positions of the ``top_n`` largest positive values, largest first"""
+    positive = np.flatnonzero(values > 0)
+    if positive.size > top_n:
+        positive = positive[np.argpartition(-values[positive], top_n - 1)[:top_n]]
+    return positive[np.argsort(-values[positive])]
+
+# ------------------------
+# Match Explanation
+# ------------------------
+class MatchExplainer:
+    """Explain the predicted category and match score from the loaded models.
+
+    Category: each resume term contributes ``tfidf weight * coef_[class, term]``
+    to the predicted class's logit. Match score: with both vectors
+    L2-normalized, the cosine is the sum over shared terms of
+    ``resume[t] * jd[t]``. Only the non-zero entries of the sparse rows are
+    touched, so an explanation costs well under a millisecond.
+    """
+
+    def __init__(self, tfidf, clf):
+        self.terms = inverse_vocabulary(tfidf)
+        self.coef = np.asarray(clf.coef_)
+        self.classes = list(clf.classes_)
+
+    def _class_weights(self, category):
+        index = self.classes.index(category)
+        if self.coef.shape[0] == 1:
+            # Binary models store one row, pointing towards classes_[1]
+            return self.coef[0] if index == 1 else -self.coef[0]
+        return self.coef[index]
+
+    def category_terms(self, resume_vector, category, top_n=DEFAULT_TOP_N):
+        """Resume terms pushing hardest towards ``category`` as [{'term', 'weight'}]"""
+        row = resume_vector.tocsr()
+        contributions = row.data * self._class_weights(category)[row.indices]
+        return [
+            {"term": self.terms[row.indices[i]], "weight": float(contributions[i])}
+            for i in _top(contributions, top_n)
+        ]
+
+    def shared_terms(self, resume_vector, jd_vector, top_n=DEFAULT_TOP_N):
+        """Terms behind the cosine similarity as [{'term', 'points', 'share'}].
+
+        ``points`` sum to the match score (0-100) over all shared terms;
+        ``share`` is each term's fraction of it.
+        """
+        resume, jd = resume_vector.tocsr(), jd_vector.tocsr()
+        norms = np.sqrt(resume.multiply(resume).sum() * jd.multiply(jd).sum())
+        if norms == 0:
+            return []
+        overlap = resume.multiply(jd).tocsr()
+        overlap.eliminate_zeros()
+        contributions = overlap.data / norms
+        total = contributions.sum()
+        return [
+            {
+                "term": self.terms[overlap.indices[i]],
+                "points": float(contributions[i]) * 100,
+                "share": float(contributions[i] / total),
+            }
+            for i in _top(contributions, top_n)
+        ]
+
+    def explain(self, resume_vector, jd_vector, category, top_n=DEFAULT_TOP_N):
+        return {
+            "category_terms": self.category_terms(resume_vector, category, top_n),
+            "shared_terms": self.shared_terms(resume_vector, jd_vector, top_n),
+        }
@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# ------------------------
+# Configuration
+# ------------------------
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "8"))
+JOBS_PER_SESSION = int(os.environ.get("JOBS_PER_SESSION", "2"))
+JOB_TTL_SECONDS = int(os.environ.get("JOB_TTL_SECONDS", "3600"))
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class JobCancelled(BaseException):
+    """Raised inside a job when cancellation was requested.
+
+    Derives from BaseException (like asyncio.CancelledError) so the
+    ``except Exception`` blocks around LLM calls don't swallow it.
+    """
+
+class JobLimitError(Exception):
+    """The session already has the maximum number of active jobs"""
+
+# ------------------------
+# Job
+# ------------------------
+class Job:
+    """One unit of background work plus its streamed partial output"""
+
+    def __init__(self, kind, session_id):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.session_id = session_id
+        self.status = PENDING
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.trace = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self._chunks = []
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+
+    @property
+    def is_active(self):
+        return self.status in (PENDING, RUNNING)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    @property
+    def partial(self):
+        with self._lock:
+            return "".join(self._chunks)
+
+    @property
+    def elapsed(self):
+        start = self.started_at or self.created_at
+        return (self.finished_at or time.time()) - start
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def append(self, text):
+        """Record streamed output; doubles as a cancellation checkpoint"""
+        self.check_cancelled()
+        with self._lock:
+            self._chunks.append(text)
+
+    def reset_partial(self, message=""):
+        """Start a new step (e.g. the second LLM call of a chained job)"""
+        with self._lock:
+            self._chunks = []
+        self.message = message
+
+# ------------------------
+# Job Manager
+# ------------------------
+class JobManager:
+    """Process-local thread pool that runs jobs outside the Streamlit script thread.
+
+    Jobs are looked up by id, so results survive reruns and tab switches as
+    long as the session keeps the id. Finished jobs are dropped after
+    ``ttl`` seconds.
+    """
+
+    def __init__(self, max_workers=JOB_WORKERS, max_per_session=JOBS_PER_SESSION, ttl=JOB_TTL_SECONDS):
+        self.max_per_session = max_per_session
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session_id, kind, fn, *args, **kwargs):
+        """Run ``fn(job, *args, **kwargs)`` in the pool; its return value becomes ``job.result``"""
+        with self._lock:
+            self._prune()
+            # Jobs already asked to cancel stop at their next checkpoint; they don't hold a slot
+            active = [
+                j for j in self._jobs.values()
+                if j.session_id == session_id and j.is_active and not j.cancel_requested
+            ]
+            if len(active) >= self.max_per_session:
+                raise JobLimitError(
+                    f"{len(active)} jobs already running; wait for one to finish or cancel it"
+                )
+            job = Job(kind, session_id)
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        if job_id is None:
+            return None
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a pending job outright, or ask a running one to stop at its next checkpoint"""
+        job = self.get(job_id)
+        if job is None or not job.is_active:
+            return False
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def forget(self, job_id):
+        """Drop a finished job once its result has been collected"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.is_active:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        for job in list(self._jobs.values()):
+            job._cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if not job.is_active and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
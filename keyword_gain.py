@@ -0,0 +1,67 @@
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+# ------------------------
+# Keyword Gain Simulator
+# ------------------------
+class KeywordGainSimulator:
+    """Rank missing JD terms by how much adding them would raise the match score.
+
+    For a raw (un-normalized) resume TF-IDF vector u and the unit JD vector j,
+    adding k occurrences of a term t absent from the resume adds
+    d = weight(k) * idf[t] to u[t] alone, so in closed form:
+
+        cos' = (u.j + d * j[t]) / sqrt(|u|^2 + d^2)
+
+    This is evaluated for every candidate term at once with numpy. One
+    caveat: typing a bigram into a resume also adds its unigrams, and
+    those are scored separately here.
+    """
+
+    def __init__(self, tfidf):
+        self.tfidf = tfidf
+        self.terms = tfidf.get_feature_names_out()
+        self.idf = tfidf.idf_
+        self.sublinear_tf = tfidf.sublinear_tf
+
+    def raw_vector(self, clean_resume):
+        """Un-normalized TF-IDF row: raw counts (via the fitted analyzer) times idf"""
+        counts = CountVectorizer.transform(self.tfidf, [clean_resume]).tocsr().astype(np.float64)
+        if self.sublinear_tf:
+            counts.data = np.log(counts.data) + 1
+        return counts.multiply(self.idf).tocsr()
+
+    def rank(self, clean_resume, jd_vector, top_n=15, occurrences=1):
+        """Return [{'term', 'gain', 'new_score'}] sorted by gain (scores in 0-100 points)"""
+        jd = jd_vector.tocsr()
+        jd_norm = np.sqrt(jd.multiply(jd).sum())
+        if jd_norm == 0:
+            return []
+
+        u = self.raw_vector(clean_resume)
+        u_norm2 = float(u.multiply(u).sum())
+        dot = float(u.multiply(jd).sum()) / jd_norm
+        base = dot / np.sqrt(u_norm2) if u_norm2 > 0 else 0.0
+
+        # Candidates: terms weighted in the JD but absent from the resume
+        candidates = jd.indices
+        jd_weights = jd.data / jd_norm
+        missing = np.asarray(u[0, candidates].todense()).ravel() == 0
+        candidates, jd_weights = candidates[missing], jd_weights[missing]
+        if candidates.size == 0:
+            return []
+
+        tf_weight = (np.log(occurrences) + 1) if self.sublinear_tf else occurrences
+        delta = tf_weight * self.idf[candidates]
+        new_scores = (dot + delta * jd_weights) / np.sqrt(u_norm2 + delta ** 2)
+        gains = new_scores - base
+
+        top = np.argsort(-gains)[:top_n]
+        return [
+            {
+                "term": str(self.terms[candidates[i]]),
+                "gain": float(gains[i]) * 100,
+                "new_score": float(new_scores[i]) * 100,
+            }
+            for i in top
+        ]
@@ -0,0 +1,354 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ------------------------
+# Configuration
+# ------------------------
+METRICS_FILE = os.environ.get("METRICS_FILE", "")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0") or 0)
+
+# Latency buckets in seconds: sub-millisecond text cleaning up to long LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# ------------------------
+# Metric Types
+# ------------------------
+def _label_key(labelnames, labels):
+    """Turn keyword labels into a hashable key in declared order"""
+    unknown = set(labels) - set(labelnames)
+    if unknown:
+        raise ValueError(f"Unknown labels: {sorted(unknown)}")
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = [f'{name}="{_escape(value)}"' for name, value in pairs]
+    return "{" + ",".join(escaped) + "}"
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Counter:
+    """Monotonically increasing count, optionally split by labels"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+class Histogram:
+    """Cumulative bucketed distribution of observed values (e.g. seconds)"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def count(self, **labels):
+        with self._lock:
+            series = self._series.get(_label_key(self.labelnames, labels))
+            return series["count"] if series else 0
+
+    def quantile(self, q, **labels):
+        """Estimate a quantile (e.g. 0.95) from bucket counts, as Prometheus does"""
+        with self._lock:
+            series = self._series.get(_label_key(self.labelnames, labels))
+            if not series or series["count"] == 0:
+                return None
+            total, counts = series["count"], list(series["counts"])
+        rank = q * total
+        lower = 0.0
+        previous = 0
+        for bound, cumulative in zip(self.buckets, counts):
+            if cumulative >= rank:
+                in_bucket = cumulative - previous
+                if in_bucket == 0:
+                    return bound
+                return lower + (bound - lower) * (rank - previous) / in_bucket
+            lower, previous = bound, cumulative
+        return self.buckets[-1]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, cumulative in zip(self.buckets, series["counts"]):
+                    labels = _format_labels(self.labelnames, key, ("le", repr(float(bound))))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key, ("le", "+Inf"))
+                lines.append(f"{self.name}_bucket{labels} {series['count']}")
+                plain = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{plain} {series['sum']}")
+                lines.append(f"{self.name}_count{plain} {series['count']}")
+        return lines
+
+# ------------------------
+# Registry
+# ------------------------
+class MetricsRegistry:
+    """Process-wide collection of metrics, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_to_file(self, path):
+        """Atomically write the exposition text (for node_exporter's textfile collector)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+def merge_expositions(texts):
+    """Sum the samples of several processes' exposition texts (counters and
+    histogram buckets/sums/counts are all additive), keeping each metric
+    family's samples together under its HELP/TYPE lines"""
+    families = {}  # family name -> (comment lines, {series: total}), in first-seen order
+
+    def family_of(series):
+        name = series.split("{", 1)[0]
+        for suffix in ("_bucket", "_sum", "_count"):
+            base = name[:-len(suffix)]
+            if name.endswith(suffix) and base in families:
+                return base
+        return name
+
+    for text in texts:
+        for line in text.splitlines():
+            if not line:
+                continue
+            if line.startswith("#"):
+                parts = line.split(" ", 3)
+                if len(parts) < 3 or parts[1] not in ("HELP", "TYPE"):
+                    continue
+                comments, _ = families.setdefault(parts[2], ([], {}))
+                if line not in comments:
+                    comments.append(line)
+                continue
+            series, _, value = line.rpartition(" ")
+            _, totals = families.setdefault(family_of(series), ([], {}))
+            totals[series] = totals.get(series, 0.0) + float(value)
+
+    rendered = []
+    for comments, totals in families.values():
+        rendered.extend(comments)
+        for series, total in totals.items():
+            rendered.append(f"{series} {int(total) if total.is_integer() else total}")
+    return "\n".join(rendered) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "resume_stage_duration_seconds",
+    "Time spent in each processing step",
+    labelnames=("stage",)
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "resume_request_duration_seconds",
+    "End-to-end time of each user request",
+    labelnames=("flow",)
+)
+REQUESTS = REGISTRY.counter(
+    "resume_requests_total",
+    "User requests handled",
+    labelnames=("flow",)
+)
+CACHE_HITS = REGISTRY.counter(
+    "resume_cache_hits_total",
+    "Cache lookups answered without recomputation",
+    labelnames=("cache",)
+)
+CACHE_MISSES = REGISTRY.counter(
+    "resume_cache_misses_total",
+    "Cache lookups that required recomputation",
+    labelnames=("cache",)
+)
+LLM_TOKENS = REGISTRY.counter(
+    "resume_llm_tokens_total",
+    "Tokens consumed by LLM calls",
+    labelnames=("task", "direction")
+)
+ERRORS = REGISTRY.counter(
+    "resume_errors_total",
+    "Errors raised or reported by a processing step",
+    labelnames=("stage",)
+)
+
+# ------------------------
+# Request Tracing
+# ------------------------
+_current_trace = ContextVar("current_trace", default=None)
+
+class RequestTrace:
+    """Per-request breakdown of stage timings, shown in the sidebar debug panel"""
+
+    def __init__(self, flow):
+        self.flow = flow
+        self.started_at = time.time()
+        self.stages = []
+        self.cache = []
+        self.tokens = {"input": 0, "output": 0}
+        self.errors = []
+        self.total_seconds = None
+
+    def as_rows(self):
+        rows = [{"stage": name, "ms": round(seconds * 1000, 2)} for name, seconds in self.stages]
+        if self.total_seconds is not None:
+            rows.append({"stage": "total", "ms": round(self.total_seconds * 1000, 2)})
+        return rows
+
+@contextmanager
+def track_request(flow):
+    """Time a whole user request; stages inside it are attached to its trace"""
+    trace = RequestTrace(flow)
+    token = _current_trace.set(trace)
+    start = time.perf_counter()
+    try:
+        yield trace
+    except Exception:
+        ERRORS.inc(stage=flow)
+        trace.errors.append(flow)
+        raise
+    finally:
+        trace.total_seconds = time.perf_counter() - start
+        _current_trace.reset(token)
+        REQUESTS.inc(flow=flow)
+        REQUEST_SECONDS.observe(trace.total_seconds, flow=flow)
+        export()
+
+@contextmanager
+def stage(name):
+    """Time one processing step and attach it to the active request, if any"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record_error(name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.stages.append((name, elapsed))
+
+def record_cache(cache, hit):
+    (CACHE_HITS if hit else CACHE_MISSES).inc(cache=cache)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.cache.append((cache, "hit" if hit else "miss"))
+
+def record_llm_usage(task, usage):
+    """Count tokens from an Anthropic ``message.usage`` object"""
+    if usage is None:
+        return
+    input_tokens = getattr(usage, "input_tokens", 0) or 0
+    output_tokens = getattr(usage, "output_tokens", 0) or 0
+    LLM_TOKENS.inc(input_tokens, task=task, direction="input")
+    LLM_TOKENS.inc(output_tokens, task=task, direction="output")
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.tokens["input"] += input_tokens
+        trace.tokens["output"] += output_tokens
+
+def record_error(stage_name):
+    ERRORS.inc(stage=stage_name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.errors.append(stage_name)
+
+# ------------------------
+# Export
+# ------------------------
+def export():
+    """Write the metrics file if METRICS_FILE is configured"""
+    if METRICS_FILE:
+        try:
+            REGISTRY.write_to_file(METRICS_FILE)
+        except OSError:
+            pass
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_http_server(port, addr="0.0.0.0"):
+    """Serve /metrics for Prometheus scraping from a daemon thread"""
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,128 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+import metrics
+from train import clean_text
+
+# ------------------------
+# Configuration
+# ------------------------
+DEFAULT_CACHE_SIZE = 256
+
+MatchScore = namedtuple(
+    "MatchScore",
+    ["similarity", "predicted_category", "resume_vector", "jd_vector"]
+)
+
+def text_hash(text):
+    """Stable cache key for a (cleaned) text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ------------------------
+# LRU Cache
+# ------------------------
+class LRUCache:
+    """Thread-safe least-recently-used cache shared across Streamlit sessions"""
+
+    def __init__(self, name, maxsize=DEFAULT_CACHE_SIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                value = self._data[key]
+                hit = True
+            else:
+                value = None
+                hit = False
+        metrics.record_cache(self.name, hit)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+# ------------------------
+# Memoized Scoring
+# ------------------------
+class Scorer:
+    """TF-IDF match scoring memoized on hashes of the cleaned resume and JD.
+
+    Vectors are cached per text so a JD shared by many resumes (or a resume
+    scored against several JDs) is transformed once; full results are cached
+    per (resume, JD) pair so Streamlit reruns and tab switches only
+    recompute when the input actually changes.
+    """
+
+    def __init__(self, tfidf, clf, clean_fn=clean_text, maxsize=DEFAULT_CACHE_SIZE):
+        self.tfidf = tfidf
+        self.clf = clf
+        self.clean_fn = clean_fn
+        self.cleaned_keys = LRUCache("clean_text", maxsize * 2)
+        self.vectors = LRUCache("tfidf_vector", maxsize * 2)
+        self.scores = LRUCache("match_score", maxsize)
+
+    def vectorize(self, text):
+        """Return (hash of cleaned text, TF-IDF row vector)"""
+        # Hashing the raw text is far cheaper than re-running the regex cleaner
+        raw_key = text_hash(text)
+        key = self.cleaned_keys.get(raw_key)
+        if key is None:
+            with metrics.stage("clean_text"):
+                cleaned = self.clean_fn(text)
+            key = text_hash(cleaned)
+            self.cleaned_keys.put(raw_key, key)
+        else:
+            cleaned = None
+        cached = self.vectors.get(key)
+        if cached is not None:
+            return key, cached
+        if cleaned is None:
+            # Vector was evicted while the raw-text mapping survived
+            with metrics.stage("clean_text"):
+                cleaned = self.clean_fn(text)
+        with metrics.stage("tfidf_transform"):
+            vector = self.tfidf.transform([cleaned])
+        self.vectors.put(key, vector)
+        return key, vector
+
+    def clear(self):
+        """Forget every cached text, vector and score (e.g. to time the cold path)"""
+        self.cleaned_keys.clear()
+        self.vectors.clear()
+        self.scores.clear()
+
+    def score(self, resume_text, job_description):
+        resume_key, resume_vector = self.vectorize(resume_text)
+        jd_key, jd_vector = self.vectorize(job_description)
+
+        pair_key = (resume_key, jd_key)
+        cached = self.scores.get(pair_key)
+        if cached is not None:
+            return cached
+
+        with metrics.stage("cosine_similarity"):
+            similarity = cosine_similarity(resume_vector, jd_vector)[0][0]
+        with metrics.stage("classify"):
+            predicted_category = self.clf.predict(resume_vector)[0]
+
+        result = MatchScore(similarity, predicted_category, resume_vector, jd_vector)
+        self.scores.put(pair_key, result)
+        return result
@@ -0,0 +1,330 @@
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from sklearn.preprocessing import normalize
+
+import metrics
+from train import clean_text, TFIDF_PATH, CLASSIFIER_PATH
+
+# ------------------------
+# Configuration
+# ------------------------
+MAX_BATCH_SIZE = 64
+MAX_WAIT_MS = 2.0
+MAX_BODY_BYTES = 5 * 1024 * 1024
+METRICS_PUBLISH_SECONDS = 1.0  # how often each worker shares its metrics with the others
+# Fixed metric labels per route, so arbitrary client paths can't create new series
+ROUTES = {"/score": "score", "/score/batch": "score_batch"}
+
+BATCH_SIZE = metrics.REGISTRY.histogram(
+    "resume_service_batch_size",
+    "Number of score requests coalesced into one transform",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+# ------------------------
+# Load Models
+# ------------------------
+def load_models(tfidf_path=TFIDF_PATH, classifier_path=CLASSIFIER_PATH):
+    with open(tfidf_path, "rb") as f:
+        tfidf = pickle.load(f)
+    with open(classifier_path, "rb") as f:
+        clf = pickle.load(f)
+    return tfidf, clf
+
+def match_status(similarity):
+    """Same thresholds as the ATS tab"""
+    if similarity > 0.6:
+        return "strong"
+    elif similarity > 0.4:
+        return "fair"
+    return "weak"
+
+# ------------------------
+# Micro-Batching
+# ------------------------
+class MicroBatcher:
+    """Coalesce concurrent score requests into one sparse transform and product.
+
+    A background thread takes the first waiting request, then keeps
+    collecting until ``max_batch_size`` requests are queued or ``max_wait_ms``
+    has passed. Under light load a request waits at most ``max_wait_ms``;
+    under heavy load batches fill up immediately.
+    """
+
+    def __init__(self, tfidf, clf, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.tfidf = tfidf
+        self.clf = clf
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, resume_text, job_description):
+        future = Future()
+        self._queue.put((resume_text, job_description, future))
+        return future
+
+    def score(self, resume_text, job_description, timeout=30):
+        return self.submit(resume_text, job_description).result(timeout)
+
+    def score_many(self, pairs, timeout=60):
+        futures = [self.submit(resume, jd) for resume, jd in pairs]
+        return [future.result(timeout) for future in futures]
+
+    def _loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        try:
+            results = score_pairs(self.tfidf, self.clf, [(resume, jd) for resume, jd, _ in batch])
+        except Exception as e:
+            metrics.record_error("service_batch")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+def score_pairs(tfidf, clf, pairs):
+    """Score (resume, JD) pairs with one transform over the distinct texts"""
+    BATCH_SIZE.observe(len(pairs))
+    with metrics.stage("service_batch"):
+        # Identical texts (typically one JD shared by many resumes) are cleaned and vectorized once
+        index = {}
+        resume_rows, jd_rows = [], []
+        for resume_text, job_description in pairs:
+            resume_rows.append(index.setdefault(resume_text, len(index)))
+            jd_rows.append(index.setdefault(job_description, len(index)))
+        cleaned = [clean_text(text) for text in index]
+
+        matrix = normalize(tfidf.transform(cleaned))
+        resumes = matrix[resume_rows]
+        # Rows are L2-normalized, so the row-wise dot product is the cosine similarity
+        similarities = np.asarray(resumes.multiply(matrix[jd_rows]).sum(axis=1)).ravel()
+        categories = clf.predict(resumes)
+
+    return [
+        {
+            "similarity": float(similarity),
+            "match_score": round(float(similarity) * 100, 2),
+            "predicted_category": str(category),
+            "match_status": match_status(similarity),
+        }
+        for similarity, category in zip(similarities, categories)
+    ]
+
+# ------------------------
+# HTTP API
+# ------------------------
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY, Nagle plus
+    # delayed ACK adds ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/healthz":
+            self._send_json(200, {"status": "ok", "pid": os.getpid()})
+        elif path == "/metrics":
+            body = self.server.render_metrics().encode("utf-8")
+            self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path = self.path.split("?")[0]
+        with metrics.track_request(f"service_{ROUTES.get(path, 'not_found')}"):
+            try:
+                payload = self._read_json()
+                if path == "/score":
+                    result = self.server.batcher.score(
+                        _require_text(payload, "resume"),
+                        _require_text(payload, "job_description")
+                    )
+                    self._send_json(200, result)
+                elif path == "/score/batch":
+                    self._send_json(200, {"results": self.server.batcher.score_many(_batch_pairs(payload))})
+                else:
+                    self._send_json(404, {"error": "not found"})
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+            except FutureTimeoutError:
+                metrics.record_error("service_timeout")
+                self._send_json(503, {"error": "Scoring timed out, retry later"})
+            except Exception as e:
+                metrics.record_error("service_internal")
+                self._send_json(500, {"error": f"Scoring failed: {e}"})
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True  # the unread body would corrupt the next request
+            if length < 0:
+                raise ValueError("Invalid Content-Length")
+            raise ValueError(f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode("utf-8"), "application/json")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _require_text(payload, field):
+    value = payload.get(field) if isinstance(payload, dict) else None
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"'{field}' must be a non-empty string")
+    return value
+
+def _batch_pairs(payload):
+    """Accept either one JD for many resumes or a list of explicit pairs"""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    if "items" in payload:
+        items = payload["items"]
+        if not isinstance(items, list) or not items:
+            raise ValueError("'items' must be a non-empty list")
+        return [(_require_text(item, "resume"), _require_text(item, "job_description")) for item in items]
+    job_description = _require_text(payload, "job_description")
+    resumes = payload.get("resumes")
+    if not isinstance(resumes, list) or not resumes:
+        raise ValueError("'resumes' must be a non-empty list")
+    return [(_require_text({"resume": resume}, "resume"), job_description) for resume in resumes]
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+    metrics_dir = None  # set when several workers share the port
+
+    def publish_metrics(self):
+        metrics.REGISTRY.write_to_file(os.path.join(self.metrics_dir, f"worker-{os.getpid()}.prom"))
+
+    def render_metrics(self):
+        """This worker's metrics, or every worker's summed when the port is shared.
+
+        A scrape lands on one arbitrary worker, so serving only its own
+        counters would look like resets between scrapes.
+        """
+        if self.metrics_dir is None:
+            return metrics.REGISTRY.render()
+        self.publish_metrics()
+        texts = []
+        for name in sorted(os.listdir(self.metrics_dir)):
+            if name.endswith(".prom"):
+                try:
+                    with open(os.path.join(self.metrics_dir, name)) as f:
+                        texts.append(f.read())
+                except OSError:
+                    pass
+        return metrics.merge_expositions(texts)
+
+# ------------------------
+# Workers
+# ------------------------
+def run_worker(server, tfidf, clf, max_batch_size, max_wait_ms):
+    """Serve from an already-bound socket; each worker has its own batcher thread"""
+    server.batcher = MicroBatcher(tfidf, clf, max_batch_size, max_wait_ms).start()
+    if server.metrics_dir is not None:
+        threading.Thread(target=_publish_loop, args=(server,), name="metrics-publisher", daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+def _publish_loop(server):
+    while True:
+        try:
+            server.publish_metrics()
+        except OSError:
+            pass
+        time.sleep(METRICS_PUBLISH_SECONDS)
+
+def serve(host="127.0.0.1", port=8000, workers=1, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+    # Models are loaded once in the parent; forked workers share the pages copy-on-write
+    tfidf, clf = load_models()
+    server = ScoringHTTPServer((host, port), ScoringHandler)
+    print(f"✓ Scoring service on http://{host}:{server.server_address[1]} ({workers} worker(s))")
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        run_worker(server, tfidf, clf, max_batch_size, max_wait_ms)
+        return
+
+    server.metrics_dir = tempfile.mkdtemp(prefix="resume-service-metrics-")
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=run_worker, args=(server, tfidf, clf, max_batch_size, max_wait_ms), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop(signum, frame):
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        stop(None, None)
+    finally:
+        server.server_close()
+        shutil.rmtree(server.metrics_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless TF-IDF match scoring and category prediction service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes sharing the port")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="Longest a request waits for batch-mates")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.max_batch_size, args.max_wait_ms)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,20 @@
 import pandas as pd
+import math
 import re
 import string
 import pickle
 import os
 from pathlib import Path
 
+from scipy.sparse import vstack
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
 
+from dedupe import find_duplicate_clusters
+from corpus_cache import load_clean_corpus, CACHE_DIR
+
 # ------------------------
 # Configuration
 # ------------------------
@@ -17,6 +22,8 @@ DATA_PATH = "data/Resume.csv"
 MODEL_DIR = "model"
 TFIDF_PATH = os.path.join(MODEL_DIR, "tfidf_vectorizer.pkl")
 CLASSIFIER_PATH = os.path.join(MODEL_DIR, "category_model.pkl")
+DEDUPE_THRESHOLD = 0.8  # Estimated Jaccard similarity above which resumes are near-duplicates
+CLEANING_VERSION = 1  # Bump when clean_text's behaviour changes (edits to its source also invalidate the cache)
 
 # ------------------------
 # Text Cleaning
@@ -72,6 +79,61 @@ def load_and_validate_data(data_path):
     
     return df
 
+# ------------------------
+# Near-Duplicate Removal
+# ------------------------
+def remove_near_duplicates(df, threshold=DEDUPE_THRESHOLD):
+    """
+    Keep one resume per cluster of near-duplicates (MinHash + LSH)
+    
+    Duplicates inflate training time and leak between the train and
+    test splits, overstating accuracy.
+    """
+    clusters = find_duplicate_clusters(df['clean_resume'].tolist(), threshold)
+    drop_positions = [position for cluster in clusters for position in cluster[1:]]
+    
+    print(f"✓ Found {len(clusters)} near-duplicate clusters (Jaccard ≥ {threshold})")
+    if clusters:
+        largest = max(len(cluster) for cluster in clusters)
+        mixed = sum(1 for cluster in clusters if df['Category'].iloc[cluster].nunique() > 1)
+        print(f"  Removed {len(drop_positions)} resumes, largest cluster: {largest} copies")
+        if mixed:
+            print(f"⚠️  Warning: {mixed} clusters span more than one category (kept the first label)")
+    
+    df = df.drop(df.index[drop_positions]).reset_index(drop=True)
+    print(f"✓ Remaining: {len(df)} unique resumes")
+    return df
+
+def split_train_test(X, y, test_size=0.2, random_state=42):
+    """
+    Stratified train/test split that tolerates very small classes
+    
+    Deduplication can leave a category with a single resume, which
+    stratification can't split; those rows go to the training set. If the
+    test set is too small to hold every class, the split isn't stratified.
+    """
+    counts = y.value_counts()
+    rare = counts[counts < 2].index
+    if len(rare):
+        print(f"⚠️  Warning: {len(rare)} categories have a single resume, training only: {', '.join(rare)}")
+    keep = ~y.isin(rare).to_numpy()
+    n_test = math.ceil(keep.sum() * test_size)
+    stratify = y[keep]
+    if n_test < stratify.nunique():
+        print(f"⚠️  Warning: {n_test} test samples can't cover {stratify.nunique()} categories, splitting without stratification")
+        stratify = None
+    
+    X_train, X_test, y_train, y_test = train_test_split(
+        X[keep], y[keep],
+        test_size=test_size,
+        stratify=stratify,
+        random_state=random_state
+    )
+    if len(rare):
+        X_train = vstack([X_train, X[~keep]]).tocsr()
+        y_train = pd.concat([y_train, y[~keep]])
+    return X_train, X_test, y_train, y_test
+
 # ------------------------
 # Main Training Pipeline
 # ------------------------
@@ -80,17 +142,21 @@ def main():
     print("AI RESUME COPILOT - MODEL TRAINING")
     print("="*60)
     
-    # Load data
+    # Load and clean data (reused from the corpus cache when neither has changed)
     try:
-        df = load_and_validate_data(DATA_PATH)
+        df, cache_hit = load_clean_corpus(DATA_PATH, load_and_validate_data, clean_text, CLEANING_VERSION)
     except Exception as e:
         print(f"❌ Error loading data: {e}")
         return
     
-    # Clean text
-    print("\nCleaning resume text...")
-    df['clean_resume'] = df['Resume'].apply(clean_text)
-    print("✓ Text cleaning complete")
+    if cache_hit:
+        print(f"✓ Loaded {len(df)} cleaned resumes from cache ({CACHE_DIR})")
+    else:
+        print("✓ Text cleaning complete (cached for future runs)")
+    
+    # Remove near-duplicates before splitting so copies can't leak into the test set
+    print("\nRemoving near-duplicate resumes...")
+    df = remove_near_duplicates(df)
     
     # ------------------------
     # TF-IDF Vectorization
@@ -115,12 +181,7 @@ def main():
     # Train-Test Split
     # ------------------------
     print("\nSplitting data (80% train, 20% test)...")
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, 
-        test_size=0.2, 
-        stratify=y, 
-        random_state=42
-    )
+    X_train, X_test, y_train, y_test = split_train_test(X, y, test_size=0.2, random_state=42)
     print(f"✓ Training samples: {X_train.shape[0]}")
     print(f"✓ Testing samples: {X_test.shape[0]}")
     